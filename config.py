@@ -12,7 +12,7 @@ from typing import Dict, Any, Optional
 from loguru import logger
 
 from smutscrape.sites import SiteManager, SiteConfiguration
-from smutscrape.downloaders import DownloadManager
+from smutscrape.downloaders import DownloadManager, install_xhr_hook
 
 
 class ConfigManager:
@@ -166,18 +166,8 @@ class ConfigManager:
                 self._selenium_driver = webdriver.Chrome(service=service, options=chrome_options)
                 logger.debug(f"Initialized Selenium driver with Chrome version: {self._selenium_driver.capabilities['browserVersion']}")
                 
-                # Inject M3U8 detection script
-                self._selenium_driver.execute_script("""
-                    (function() {
-                        let open = XMLHttpRequest.prototype.open;
-                        XMLHttpRequest.prototype.open = function(method, url) {
-                            if (url.includes(".m3u8")) {
-                                console.log("🔥 Found M3U8 via XHR:", url);
-                            }
-                            return open.apply(this, arguments);
-                        };
-                    })();
-                """)
+                # Register the MP4/M3U8 detection script for every page this driver loads
+                install_xhr_hook(self._selenium_driver)
                 
                 # Store User-Agent for later use
                 self._selenium_user_agent = self._selenium_driver.execute_script("return navigator.userAgent;")
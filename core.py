@@ -32,7 +32,7 @@ from smutscrape.utilities import (
 )
 from smutscrape.metadata import finalize_metadata, generate_nfo
 from smutscrape.session import is_url_processed
-from smutscrape.sites import SiteConfiguration
+from smutscrape.sites import SiteConfiguration, normalize_netloc
 
 
 def get_config_manager():
@@ -441,10 +441,10 @@ def construct_url(base_url, pattern, site_config, mode=None, **kwargs):
 
 def match_url_to_mode(url, site_config):
     parsed_url = urlparse(url)
-    netloc = parsed_url.netloc.lower().replace("www.", "", 1)
+    netloc = normalize_netloc(parsed_url.netloc)
     full_path = parsed_url.path.rstrip("/").lower() + ("?" + parsed_url.query.lower() if parsed_url.query else "")
     
-    base_netloc = urlparse(site_config["base_url"]).netloc.lower().replace("www.", "", 1)
+    base_netloc = normalize_netloc(urlparse(site_config["base_url"]).netloc)
     if netloc != base_netloc:
         # logger.debug(f"No match: netloc '{netloc}' != base_netloc '{base_netloc}'")
         return None, None
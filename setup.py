@@ -41,8 +41,14 @@ setup(
     install_requires=read_requirements(),
     extras_require={
         "selenium": ["selenium", "webdriver-manager"],
-        "api": ["fastapi", "uvicorn"],
+        "api": ["fastapi", "uvicorn", "prometheus-fastapi-instrumentator", "prometheus-client"],
         "dev": ["pytest", "black", "flake8", "mypy"],
+        "speedups": ["orjson", "pyahocorasick"],
+        "all": [
+            "selenium", "webdriver-manager",
+            "fastapi", "uvicorn", "prometheus-fastapi-instrumentator", "prometheus-client",
+            "orjson", "pyahocorasick",
+        ],
     },
     entry_points={
         "console_scripts": [
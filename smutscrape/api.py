@@ -6,25 +6,35 @@ This module provides a FastAPI-based REST API for the smutscrape application,
 allowing remote execution of scraping commands and task management.
 """
 
+import asyncio
 import json
+import re
+import time
 import uuid
 import threading
 from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor
 
 # FastAPI imports
 try:
     from fastapi import FastAPI, HTTPException, BackgroundTasks
     from fastapi.responses import JSONResponse, StreamingResponse
     from fastapi.middleware.cors import CORSMiddleware
-    from pydantic import BaseModel, Field
+    from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
     import uvicorn
     FASTAPI_AVAILABLE = True
 except ImportError:
     FASTAPI_AVAILABLE = False
 
+# Prometheus metrics (optional)
+try:
+    from prometheus_fastapi_instrumentator import Instrumentator
+    from prometheus_client import Gauge
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
 from loguru import logger
 
 # Import from the modular structure
@@ -50,6 +60,9 @@ except ImportError:
 SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 SITE_DIR = os.path.join(SCRIPT_DIR, 'sites')
 
+# Accepted page syntax: 'N' or 'N.M' (page N, starting at video M)
+PAGE_PATTERN = re.compile(r'^\d+(?:\.\d+)?$')
+
 
 # Pydantic models for API requests/responses
 class ScrapeRequest(BaseModel):
@@ -60,6 +73,35 @@ class ScrapeRequest(BaseModel):
     page: str = Field("1", description="Page to start from (e.g., '12.9' for page 12, video 9)")
     applystate: bool = Field(False, description="Add URLs to .state if file exists")
     debug: bool = Field(False, description="Enable debug logging")
+    _page_num: int = PrivateAttr(1)
+    _video_offset: int = PrivateAttr(0)
+
+    @field_validator('page')
+    @classmethod
+    def validate_page(cls, v: str) -> str:
+        """Reject malformed pages before a task is ever created"""
+        v = v.strip()
+        if not PAGE_PATTERN.match(v):
+            raise ValueError("page must be 'N' or 'N.M' (e.g., '12' or '12.9')")
+        return v
+
+    @model_validator(mode='after')
+    def parse_page(self) -> 'ScrapeRequest':
+        """Split the validated page into page number and video offset once"""
+        page_num, _, video_offset = self.page.partition('.')
+        self._page_num = int(page_num)
+        self._video_offset = int(video_offset) if video_offset else 0
+        return self
+
+    @property
+    def page_num(self) -> int:
+        """Page to start from"""
+        return self._page_num
+
+    @property
+    def video_offset(self) -> int:
+        """Video on the starting page to begin with"""
+        return self._video_offset
 
 
 class ScrapeResponse(BaseModel):
@@ -108,14 +150,32 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-# Thread executor for running blocking operations
-executor = ThreadPoolExecutor(max_workers=4)
-
 # Task tracking
 active_tasks = OrderedDict()  # task_id -> task_info
 task_lock = threading.Lock()
 MAX_TASK_HISTORY = 100  # Keep last 100 tasks in memory
 
+# Number of scrape commands currently running; the last one out tears down
+# the VPN and shared session state so concurrent tasks aren't cut off. The lock
+# is held through teardown so a new command can't start while it runs.
+_active_count = 0
+_active_count_lock = threading.Lock()
+# General config of the latest command that loaded one, kept for the teardown
+_teardown_config = None
+
+# Expose /metrics when the instrumentator is installed
+if PROMETHEUS_AVAILABLE:
+    Instrumentator().instrument(app).expose(app)
+
+    def _count_tasks(status: str) -> int:
+        with task_lock:
+            return sum(1 for info in active_tasks.values() if info["status"] == status)
+
+    tasks_pending_gauge = Gauge('smutscrape_tasks_pending', 'Scrape tasks waiting to start')
+    tasks_pending_gauge.set_function(lambda: _count_tasks("pending"))
+    tasks_running_gauge = Gauge('smutscrape_tasks_running', 'Scrape tasks currently running')
+    tasks_running_gauge.set_function(lambda: _count_tasks("running"))
+
 
 @app.options("/scrape")
 async def options_scrape():
@@ -135,7 +195,9 @@ async def root():
             "/sites/{code}": "Get detailed information about a specific site",
             "/scrape": "Execute a scrape command (returns immediately with task_id)",
             "/tasks/{task_id}": "Get status of a specific task",
-            "/tasks": "List all tasks (optional: ?status=pending/running/completed/failed)"
+            "/tasks": "List all tasks (optional: ?status=pending/running/completed/failed)",
+            "/healthz": "Health check including event loop lag",
+            "/metrics": "Prometheus metrics (requires prometheus-fastapi-instrumentator)"
         },
         "notes": [
             "POST /scrape returns immediately with a task_id",
@@ -145,6 +207,32 @@ async def root():
     }
 
 
+@app.get("/healthz", response_model=Dict[str, Any])
+async def healthz():
+    """Health check reporting how long the event loop takes to get back to us"""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.sleep(0)
+    loop_lag_ms = (loop.time() - start) * 1000
+    
+    # Round-trip through the default executor to spot a saturated thread pool
+    executor_start = time.monotonic()
+    await loop.run_in_executor(None, time.monotonic)
+    executor_lag_ms = (time.monotonic() - executor_start) * 1000
+    
+    with task_lock:
+        pending = sum(1 for info in active_tasks.values() if info["status"] == "pending")
+        running = sum(1 for info in active_tasks.values() if info["status"] == "running")
+    
+    return {
+        "status": "ok",
+        "loop_lag_ms": round(loop_lag_ms, 3),
+        "executor_lag_ms": round(executor_lag_ms, 3),
+        "tasks_pending": pending,
+        "tasks_running": running
+    }
+
+
 @app.get("/sites", response_model=List[SiteInfo])
 async def get_sites():
     """Get list of all supported sites"""
@@ -224,8 +312,12 @@ async def get_site(code: str):
 
 
 def run_scrape_command(command: str, overwrite: bool = False, re_nfo: bool = False, 
-                      page: str = "1", applystate: bool = False, debug: bool = False):
-    """Execute a scrape command in a thread"""
+                      page: str = "1", applystate: bool = False, debug: bool = False,
+                      page_num: int = 1, video_offset: int = 0):
+    """Execute a scrape command in a thread
+    
+    page_num and video_offset are the parts of page, as parsed by ScrapeRequest.
+    """
     import shlex
     import sys
     
@@ -245,10 +337,8 @@ def run_scrape_command(command: str, overwrite: bool = False, re_nfo: bool = Fal
             self.applystate = applystate
             self.debug = debug
             self.table = None
-            # Parse page into page_num and video_offset
-            page_parts = page.split('.')
-            self.page_num = int(page_parts[0])
-            self.video_offset = int(page_parts[1]) if len(page_parts) > 1 else 0
+            self.page_num = page_num
+            self.video_offset = video_offset
     
     mock_args = MockArgs()
     
@@ -262,11 +352,17 @@ def run_scrape_command(command: str, overwrite: bool = False, re_nfo: bool = Fal
             filter=lambda record: record["level"].name == "DEBUG"
         )
     
+    global _active_count, _teardown_config
+    with _active_count_lock:
+        _active_count += 1
+    
     try:
         # Load configurations
         general_config = load_configuration('general')
         if not general_config:
             return {"success": False, "message": "Failed to load general configuration"}
+        with _active_count_lock:
+            _teardown_config = general_config
         
         # Initialize download manager via config manager
         from smutscrape.cli import get_config_manager
@@ -337,9 +433,14 @@ def run_scrape_command(command: str, overwrite: bool = False, re_nfo: bool = Fal
             "message": f"Error executing command: {str(e)}"
         }
     finally:
-        # Cleanup
-        handle_vpn(general_config, 'stop')
-        cleanup(general_config)
+        # Cleanup only once the last concurrent command has finished, even if this one
+        # failed before loading its own config while earlier ones left the VPN up
+        with _active_count_lock:
+            _active_count -= 1
+            if _active_count == 0 and _teardown_config:
+                handle_vpn(_teardown_config, 'stop')
+                cleanup(_teardown_config)
+                _teardown_config = None
 
 
 def validate_and_prepare_command(command: str, overwrite: bool = False, re_nfo: bool = False, 
@@ -388,7 +489,7 @@ def validate_and_prepare_command(command: str, overwrite: bool = False, re_nfo:
 
 
 def run_scrape_task(task_id: str, command: str, overwrite: bool, re_nfo: bool, 
-                   page: str, applystate: bool, debug: bool):
+                   page: str, applystate: bool, debug: bool, page_num: int, video_offset: int):
     """Execute scraping task and update task status"""
     with task_lock:
         if task_id in active_tasks:
@@ -396,7 +497,8 @@ def run_scrape_task(task_id: str, command: str, overwrite: bool, re_nfo: bool,
             active_tasks[task_id]["started_at"] = datetime.now().isoformat()
     
     try:
-        result = run_scrape_command(command, overwrite, re_nfo, page, applystate, debug)
+        result = run_scrape_command(command, overwrite, re_nfo, page, applystate, debug,
+                                    page_num, video_offset)
         
         with task_lock:
             if task_id in active_tasks:
@@ -462,7 +564,9 @@ async def scrape(request: ScrapeRequest, background_tasks: BackgroundTasks):
         request.re_nfo,
         request.page,
         request.applystate,
-        request.debug
+        request.debug,
+        request.page_num,
+        request.video_offset
     )
     
     return ScrapeResponse(
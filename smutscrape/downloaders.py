@@ -9,6 +9,8 @@ for downloading video files using different tools and protocols.
 import os
 import re
 import json
+import codecs
+import selectors
 import random
 import requests
 import subprocess
@@ -19,11 +21,135 @@ import tempfile
 import shutil
 import uuid
 import time
+import threading
+import weakref
+from collections import OrderedDict
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from abc import ABC, abstractmethod
 from typing import Dict, Optional, Tuple, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 from loguru import logger
+from smutscrape.utilities import is_url, process_title, construct_filename
+
+# Faster JSON parsing for ffprobe output when orjson is installed
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Size of the pooled HTTP connection pool shared by all downloaders
+HTTP_POOL_SIZE = 16
+# Read size for streamed HTTP bodies and write buffer for the output file
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+FILE_BUFFER_SIZE = 1 << 20
+# Files smaller than this are fetched over a single connection
+PARALLEL_MIN_SIZE = 16 << 20
+# Number of ffprobe results kept by DownloadManager
+METADATA_CACHE_SIZE = 128
+# Anything smaller than this can't be a usable video, so skip ffprobe
+MIN_VIDEO_SIZE = 64 * 1024
+# Lowest average data rate (bytes/s) accepted for a video of a given duration
+MIN_VIDEO_BYTE_RATE = 10240
+# Downloader-reported details are only trusted when the output reached the input's
+# duration within this many seconds and its rate clears the minimum by this factor
+STREAM_INFO_DURATION_TOLERANCE = 2.0
+STREAM_INFO_RATE_MARGIN = 2
+
+# wget output: group 1 is a progress percentage, group 2 the announced length
+WGET_OUTPUT_PATTERN = re.compile(r'(\d+)%\s+\d+[KMG]?|Length:\s+(\d+)')
+# Minimum seconds between stat() calls on a file being written by wget
+WGET_STAT_INTERVAL = 0.25
+# Keep temporary M3U8 playlists in RAM where a tmpfs is available
+PLAYLIST_TEMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+# Playlist tags that need ffmpeg's own HLS handling (variants, init maps, byte ranges)
+HLS_FFMPEG_ONLY_TAGS = ("#EXT-X-STREAM-INF", "#EXT-X-MAP", "#EXT-X-BYTERANGE")
+
+# Fixed parts of the external tool command lines
+CURL_BASE_ARGS = (
+    "curl", "-L", "--retry", "3", "--max-time", "600", "-#",
+    "-w", "Downloaded: %{size_download} bytes / Total: %{size_total} bytes (%{speed_download} bytes/s)\n"
+)
+WGET_BASE_ARGS = ("wget", "--tries=3", "--timeout=600")
+YTDLP_BASE_ARGS = ("yt-dlp", "--progress")
+FFMPEG_PLAYLIST_INPUT_ARGS = ("-protocol_whitelist", "file,http,https,tcp,tls,crypto")
+FFMPEG_CONCAT_INPUT_ARGS = ("-f", "concat", "-safe", "0")
+FFMPEG_OUTPUT_ARGS = ("-c", "copy", "-bsf:a", "aac_adtstoasc", "-progress", "pipe:1", "-nostats", "-y")
+
+# Stream details ffmpeg prints to stderr while muxing
+FFMPEG_DURATION_PATTERN = re.compile(rb'Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)')
+FFMPEG_RESOLUTION_PATTERN = re.compile(rb'Stream #.*Video:.*?\b(\d{2,5})x(\d{2,5})\b')
+FFMPEG_ERROR_PATTERN = re.compile(rb'error|failed', re.IGNORECASE)
+
+# yt-dlp download progress lines
+YTDLP_PROGRESS_PATTERN = re.compile(r'\[download\]\s+(\d+\.\d+)% of ~?\s*(\d+\.\d+)(K|M|G)iB')
+# Marker for the final file paths yt-dlp prints once each download is moved into place
+YTDLP_FILEPATH_PREFIX = '[filepath] '
+# Characters replaced when deriving a fallback title from a URL path
+TITLE_SANITIZE_PATTERN = re.compile(r'[^a-zA-Z0-9_.-]')
+
+# aria2c progress as relayed by yt-dlp, e.g. "[#2089b0 12MiB/100MiB(12%) CN:8 DL:5.1MiB]"
+ARIA2C_PROGRESS_PATTERN = re.compile(r'\[#\w+\s+([\d.]+)([KMG]?)i?B/([\d.]+)([KMG]?)i?B\(')
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024**2, 'G': 1024**3}
+
+# Browser network detection: give up after DETECTION_TIMEOUT seconds, or stop
+# early once matching responses have been quiet for DETECTION_QUIET_PERIOD
+DETECTION_TIMEOUT = 5.0
+DETECTION_QUIET_PERIOD = 0.5
+DETECTION_POLL_INTERVAL = 0.1
+# Logs media requests made through XHR; registered to run before any page script
+XHR_HOOK_SCRIPT = """
+(function() {
+    let open = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function(method, url) {
+        if (url.includes(".mp4")) {
+            console.log("🔥 Found MP4 via XHR:", url);
+        } else if (url.includes(".m3u8")) {
+            console.log("🔥 Found M3U8 via XHR:", url);
+        }
+        return open.apply(this, arguments);
+    };
+})();
+"""
+# Drivers that already have XHR_HOOK_SCRIPT registered
+_hooked_drivers = weakref.WeakSet()
+# Name/value pair of a Selenium cookie dict, for building Cookie headers
+COOKIE_FIELDS = itemgetter('name', 'value')
+# Resolution hints in media URLs: "1080p"/"1080p60" (group 1) or "1920x1080" (group 2 is the height),
+# not counting digits embedded in longer tokens such as "a1080p3" or "12345x7200"
+RESOLUTION_HINT_PATTERN = re.compile(
+    r'(?<![0-9a-z])(\d{3,4})p(?:\d{2})?(?![0-9a-z])|(?<!\d)\d{3,4}x(\d{3,4})(?!\d)', re.IGNORECASE
+)
+# Standard heights or dimensions that mark an MP4 response as a likely video rather than a preview
+MP4_QUALITY_HINT_PATTERN = re.compile(
+    r'(?<![0-9a-z])(?:240|360|480|720|1080|1440|2160)p(?:\d{2})?(?![0-9a-z])|(?<!\d)\d{3,4}x\d{3,4}(?!\d)',
+    re.IGNORECASE
+)
+
+
+def install_xhr_hook(driver):
+    """
+    Register XHR_HOOK_SCRIPT with the browser so it runs on every new document,
+    and enable network events so performance logs include the first request.
+    """
+    if driver in _hooked_drivers:
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Page.enable', {})
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': XHR_HOOK_SCRIPT})
+        _hooked_drivers.add(driver)
+    except Exception as e:
+        logger.debug(f"Could not register XHR hook via CDP: {e}")
+
+
+def resolution_score(url: str) -> int:
+    """Return the highest video height hinted at in a URL, or -1 if there is none."""
+    return max((int(p or h) for p, h in RESOLUTION_HINT_PATTERN.findall(url)), default=-1)
 
 
 class DownloadError(Exception):
@@ -31,12 +157,114 @@ class DownloadError(Exception):
     pass
 
 
+def create_http_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """Create a requests session with a pooled, retrying HTTP adapter"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def resolve_playlist_lines(playlist_url: str, lines) -> list:
+    """Make segment URIs in M3U8 playlist lines absolute, leaving tags untouched"""
+    base_url = playlist_url.rsplit('/', 1)[0] + "/"
+    parts = urllib.parse.urlsplit(base_url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    # Plain concatenation is only safe when the base has no query or fragment
+    simple_base = not parts.query and not parts.fragment
+    
+    resolved = []
+    for line in lines:
+        if not line or line.startswith(("#", "http")):
+            resolved.append(line)
+        elif simple_base and line[0] not in "/.?" and ":" not in line:
+            resolved.append(base_url + line)
+        elif simple_base and line[0] == "/" and not line.startswith("//"):
+            resolved.append(origin + line)
+        else:
+            resolved.append(urllib.parse.urljoin(base_url, line))
+    return resolved
+
+
+def playlist_segments(lines):
+    """Split M3U8 playlist lines into segment URIs and their EXTINF durations (None if unknown)"""
+    segments, durations = [], []
+    duration = None
+    for line in lines:
+        if line.startswith("#EXTINF:"):
+            try:
+                duration = float(line[8:].split(",", 1)[0])
+            except ValueError:
+                duration = None
+        elif line and not line.startswith("#"):
+            segments.append(line)
+            durations.append(duration)
+            duration = None
+    return segments, durations
+
+
+def iter_process_lines(stream, timeout: float = 0.1):
+    """
+    Yield text lines from a subprocess pipe as soon as they arrive.
+    
+    Reads the raw file descriptor once the selector reports data, so lines held
+    in a userspace buffer can't stall progress. Carriage returns end a line too,
+    matching universal newlines. Platforms that can't select on pipes fall back
+    to plain readline.
+    """
+    fd = stream.fileno()
+    selector = selectors.DefaultSelector()
+    try:
+        selector.register(fd, selectors.EVENT_READ)
+    except (OSError, ValueError):
+        selector.close()
+        yield from iter(stream.readline, '')
+        return
+    
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    pending = ''
+    with selector:
+        while True:
+            if not selector.select(timeout):
+                continue
+            chunk = os.read(fd, DOWNLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (pending + decoder.decode(chunk)).splitlines(keepends=True)
+            pending = lines.pop() if lines and not lines[-1].endswith(('\n', '\r')) else ''
+            yield from lines
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def preallocate_file(fd: int, size: int):
+    """Pre-size a file being downloaded and hint sequential access to the kernel"""
+    from smutscrape.storage import allocate_file
+    allocate_file(fd, size)
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+        except OSError as e:
+            logger.debug(f"posix_fadvise unsupported here: {e}")
+
+
 class BaseDownloader(ABC):
     """Abstract base class for all downloaders"""
     
-    def __init__(self, general_config: Dict[str, Any], site_config: Dict[str, Any]):
+    def __init__(self, general_config: Dict[str, Any], site_config: Dict[str, Any],
+                 session: Optional[requests.Session] = None):
         self.general_config = general_config
         self.site_config = site_config
+        # Shared session so connections are reused across downloads
+        self.session = session or create_http_session()
+        # Duration/resolution reported by the tool during the last download, if any
+        self.last_metadata = None
     
     @abstractmethod
     def download(self, url: str, destination_path: str, headers: Optional[Dict] = None, 
@@ -67,8 +295,15 @@ class BaseDownloader(ABC):
 class RequestsDownloader(BaseDownloader):
     """Downloader using Python requests library"""
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Reused read buffer so streaming doesn't allocate a new bytes per chunk
+        self._buffer = bytearray(DOWNLOAD_CHUNK_SIZE)
+        self._view = memoryview(self._buffer)
+    
     def download(self, url: str, destination_path: str, headers: Optional[Dict] = None,
-                 metadata: Optional[Dict] = None, desc: str = "Downloading", **kwargs) -> bool:
+                 metadata: Optional[Dict] = None, desc: str = "Downloading", 
+                 parallel_connections: int = 4, **kwargs) -> bool:
         """Download using requests library with progress bar"""
         headers = headers or {}
         headers["User-Agent"] = self.get_user_agent(headers)
@@ -76,32 +311,107 @@ class RequestsDownloader(BaseDownloader):
         logger.debug(f"Executing requests GET: {url} with headers: {headers}")
         
         try:
-            with requests.get(url, headers=headers, stream=True) as r:
-                r.raise_for_status()
-                total_size = int(r.headers.get("Content-Length", 0)) or None
-                if not total_size:
-                    logger.debug("Content-Length unavailable; total size will be determined at completion.")
-                
-                os.makedirs(os.path.dirname(destination_path), exist_ok=True)
-                with open(destination_path, "wb") as f:
-                    with tqdm(total=total_size, unit="B", unit_scale=True, desc=desc, disable=False) as pbar:
-                        for chunk in r.iter_content(chunk_size=1024):
-                            size = f.write(chunk)
-                            pbar.update(size)
-                            if not total_size:
-                                pbar.total = pbar.n
-            
-            if os.path.exists(destination_path):
-                final_size = os.path.getsize(destination_path)
-                logger.info(f"Successfully completed download to {destination_path}")
-                return True
+            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+            
+            total_size = None
+            if parallel_connections > 1 and hasattr(os, 'pwrite'):
+                total_size = self._get_ranged_size(url, headers)
+            
+            if total_size and total_size >= PARALLEL_MIN_SIZE:
+                self._download_ranges(url, destination_path, headers, total_size, parallel_connections, desc)
             else:
+                self._download_stream(url, destination_path, headers, desc)
+            
+            if not os.path.exists(destination_path):
                 logger.error("Download failed: File not found")
                 return False
+            final_size = os.path.getsize(destination_path)
+            if not final_size:
+                logger.error(f"Download failed: {destination_path} is empty")
+                return False
+            logger.info(f"Successfully completed download to {destination_path} ({final_size} bytes)")
+            return True
                 
         except Exception as e:
             logger.error(f"Requests download failed: {e}")
             return False
+    
+    def _get_ranged_size(self, url: str, headers: Dict) -> Optional[int]:
+        """Return Content-Length if the server accepts byte ranges, otherwise None"""
+        try:
+            response = self.session.head(url, headers=headers, timeout=10, allow_redirects=True)
+            response.raise_for_status()
+        except Exception as e:
+            logger.debug(f"HEAD request failed, using single connection: {e}")
+            return None
+        if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+            return None
+        return int(response.headers.get("Content-Length", 0)) or None
+    
+    def _download_stream(self, url: str, destination_path: str, headers: Dict, desc: str):
+        """Download over a single streamed connection"""
+        with self.session.get(url, headers=headers, stream=True) as r:
+            r.raise_for_status()
+            total_size = int(r.headers.get("Content-Length", 0)) or None
+            if not total_size:
+                logger.debug("Content-Length unavailable; total size will be determined at completion.")
+            
+            r.raw.decode_content = True
+            with open(destination_path, "wb", buffering=FILE_BUFFER_SIZE) as f:
+                if total_size:
+                    preallocate_file(f.fileno(), total_size)
+                with tqdm(total=total_size, unit="B", unit_scale=True, desc=desc, disable=False) as pbar:
+                    while True:
+                        n = r.raw.readinto(self._buffer)
+                        if not n:
+                            break
+                        size = f.write(self._view[:n])
+                        pbar.update(size)
+                        if not total_size:
+                            pbar.total = pbar.n
+                if total_size:
+                    # Trim to what was actually written (short or decoded bodies)
+                    f.truncate()
+    
+    def _download_ranges(self, url: str, destination_path: str, headers: Dict, 
+                         total_size: int, connections: int, desc: str):
+        """Download byte ranges concurrently, writing each straight to its offset"""
+        part_size = -(-total_size // connections)
+        ranges = [(start, min(start + part_size, total_size) - 1) for start in range(0, total_size, part_size)]
+        logger.debug(f"Downloading {total_size} bytes in {len(ranges)} ranges")
+        
+        pbar_lock = threading.Lock()
+        fd = os.open(destination_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            preallocate_file(fd, total_size)
+            with tqdm(total=total_size, unit="B", unit_scale=True, desc=desc, disable=False) as pbar:
+                def fetch_range(start: int, end: int):
+                    range_headers = {**headers, "Range": f"bytes={start}-{end}"}
+                    with self.session.get(url, headers=range_headers, stream=True, timeout=30) as r:
+                        r.raise_for_status()
+                        if r.status_code != 206:
+                            raise DownloadError(f"Server ignored range request (status {r.status_code})")
+                        r.raw.decode_content = True
+                        buffer = bytearray(DOWNLOAD_CHUNK_SIZE)
+                        view = memoryview(buffer)
+                        offset = start
+                        while True:
+                            n = r.raw.readinto(buffer)
+                            if not n:
+                                break
+                            os.pwrite(fd, view[:n], offset)
+                            offset += n
+                            with pbar_lock:
+                                pbar.update(n)
+                    if offset != end + 1:
+                        raise DownloadError(f"Range {start}-{end} ended early at byte {offset}")
+                
+                with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                    futures = [pool.submit(fetch_range, start, end) for start, end in ranges]
+                    for future in futures:
+                        future.result()
+        finally:
+            os.close(fd)
 
 
 class CurlDownloader(BaseDownloader):
@@ -114,15 +424,12 @@ class CurlDownloader(BaseDownloader):
         ua = self.get_user_agent(headers)
         
         # Build curl command
-        command = ["curl", "-L", "-o", destination_path, "--retry", "3", "--max-time", "600", "-#", 
-                   "-w", "Downloaded: %{size_download} bytes / Total: %{size_total} bytes (%{speed_download} bytes/s)\n"]
-        
-        command.extend(["-A", ua])
-        if "Referer" in headers:
-            command.extend(["-H", f"Referer: {headers['Referer']}"])
-        if "Cookie" in headers:
-            command.extend(["-H", f"Cookie: {headers['Cookie']}"])
-        command.append(url)
+        command = [
+            *CURL_BASE_ARGS, "-o", destination_path, "-A", ua,
+            *(("-H", f"Referer: {headers['Referer']}") if "Referer" in headers else ()),
+            *(("-H", f"Cookie: {headers['Cookie']}") if "Cookie" in headers else ()),
+            url
+        ]
         
         logger.debug(f"Executing curl command: {' '.join(shlex.quote(arg) for arg in command)}")
         
@@ -159,13 +466,12 @@ class WgetDownloader(BaseDownloader):
         headers = headers or {}
         ua = self.get_user_agent(headers)
         
-        command = ["wget", "--tries=3", "--timeout=600", "-O", destination_path]
-        command.extend(["--user-agent", ua])
-        if "Referer" in headers:
-            command.extend(["--referer", headers['Referer']])
-        if "Cookie" in headers:
-            command.extend(["--header", f"Cookie: {headers['Cookie']}"])
-        command.append(url)
+        command = [
+            *WGET_BASE_ARGS, "-O", destination_path, "--user-agent", ua,
+            *(("--referer", headers['Referer']) if "Referer" in headers else ()),
+            *(("--header", f"Cookie: {headers['Cookie']}") if "Cookie" in headers else ()),
+            url
+        ]
         
         logger.debug(f"Executing wget command: {' '.join(shlex.quote(arg) for arg in command)}")
         
@@ -173,24 +479,35 @@ class WgetDownloader(BaseDownloader):
             process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
             
             total_size = self._get_content_length(url, headers)
-            progress_regex = re.compile(r'(\d+)%\s+(\d+[KMG]?)')
             
-            with tqdm(total=total_size, unit='B', unit_scale=True, desc=desc, disable=not total_size) as pbar:
+            last_stat = 0.0
+            last_percent = 0
+            with tqdm(total=total_size, unit='B', unit_scale=True, desc=desc, disable=not total_size,
+                      mininterval=0.25) as pbar:
                 for line in process.stdout:
-                    match = progress_regex.search(line)
-                    if match:
-                        percent, _ = match.groups()
-                        if total_size:
-                            pbar.update((int(percent) * total_size // 100) - pbar.n)
-                    elif "Length:" in line and total_size is None:
-                        size_match = re.search(r'Length: (\d+)', line)
-                        if size_match:
-                            size = int(size_match.group(1))
-                            pbar.total = size
+                    match = WGET_OUTPUT_PATTERN.search(line)
+                    if match and match.group(1):
+                        percent = int(match.group(1))
+                        # Only move forward, and only when the percentage changes
+                        if total_size and percent > last_percent:
+                            last_percent = percent
+                            position = percent * total_size // 100
+                            if position > pbar.n:
+                                pbar.update(position - pbar.n)
+                    elif match and total_size is None:
+                        pbar.total = int(match.group(2))
                     elif line.strip():
                         logger.debug(f"wget output: {line.strip()}")
-                    if os.path.exists(destination_path):
-                        pbar.update(os.path.getsize(destination_path) - pbar.n)
+                    
+                    now = time.monotonic()
+                    if now - last_stat >= WGET_STAT_INTERVAL:
+                        last_stat = now
+                        try:
+                            size = os.stat(destination_path).st_size
+                        except FileNotFoundError:
+                            size = 0
+                        if size > pbar.n:
+                            pbar.update(size - pbar.n)
             
             return_code = process.wait()
             if return_code != 0:
@@ -214,7 +531,7 @@ class WgetDownloader(BaseDownloader):
             if "Cookie" in headers:
                 fetch_headers["Cookie"] = headers["Cookie"]
                 
-            response = requests.head(url, headers=fetch_headers, timeout=10, allow_redirects=True)
+            response = self.session.head(url, headers=fetch_headers, timeout=10, allow_redirects=True)
             response.raise_for_status()
             return int(response.headers.get("Content-Length", 0)) or None
         except Exception as e:
@@ -232,7 +549,7 @@ class YtDlpDownloader(BaseDownloader):
         headers = headers or {}
         ua = self.get_user_agent(headers)
         
-        command = ["yt-dlp", "-o", destination_path, "--user-agent", ua, "--progress"]
+        command = [*YTDLP_BASE_ARGS, "-o", destination_path, "--user-agent", ua]
         
         if overwrite:
             command.append("--force-overwrite")
@@ -278,10 +595,16 @@ class YtDlpDownloader(BaseDownloader):
 class FFmpegDownloader(BaseDownloader):
     """Downloader using FFmpeg for M3U8/streaming content"""
     
+    def __init__(self, *args, scraper=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Reused so Cloudflare clearance cookies and connections carry over
+        self.scraper = scraper or cloudscraper.create_scraper()
+    
     def download(self, url: str, destination_path: str, headers: Optional[Dict] = None,
                  metadata: Optional[Dict] = None, desc: str = "Downloading", 
-                 origin: Optional[str] = None, **kwargs) -> bool:
+                 origin: Optional[str] = None, segment_workers: int = 1, **kwargs) -> bool:
         """Download M3U8 streams using FFmpeg"""
+        self.last_metadata = None
         headers = headers or {}
         ua = self.get_user_agent(headers)
         
@@ -303,42 +626,48 @@ class FFmpegDownloader(BaseDownloader):
         
         logger.debug(f"Fetching M3U8 with headers: {fetch_headers}")
         
+        temp_m3u8_path = None
+        staging_dir = None
         try:
             # Fetch M3U8 content
-            scraper = cloudscraper.create_scraper()
-            response = scraper.get(url, headers=fetch_headers, timeout=30)
+            response = self.scraper.get(url, headers=fetch_headers, timeout=30)
             response.raise_for_status()
             m3u8_content = response.text
             logger.debug(f"Fetched M3U8 content: {m3u8_content[:100]}...")
             
             # Write M3U8 content with resolved URLs
-            temp_m3u8_path = destination_path + ".m3u8"
-            with open(temp_m3u8_path, "w", encoding="utf-8") as f:
-                base_url = url.rsplit('/', 1)[0] + "/"
-                segments = []
-                
-                for line in m3u8_content.splitlines():
-                    if line and not line.startswith("#"):
-                        if not line.startswith("http"):
-                            line = urllib.parse.urljoin(base_url, line)
-                        segments.append(line)
-                        f.write(line + "\n")
-                    else:
-                        f.write(line + "\n")
+            playlist_lines = m3u8_content.splitlines()
+            rewritten = resolve_playlist_lines(url, playlist_lines)
+            segments, segment_durations = playlist_segments(rewritten)
+            all_absolute = rewritten == playlist_lines
             
             total_segments = len(segments)
             logger.debug(f"Found {total_segments} segments in M3U8")
             
+            desc = f"Downloading {os.path.basename(destination_path)}"
+            fetch_segments = segment_workers > 1 and segments and self._segments_fetchable(rewritten)
+            playlist_duration = None
+            if fetch_segments:
+                # Fetch segments concurrently into the temp dir, then let ffmpeg only mux local files
+                segment_headers = {k: v for k, v in fetch_headers.items() if k != "Accept"}
+                staging_dir = tempfile.mkdtemp(prefix="smutscrape_segments_")
+                concat_list_path = self._download_segments(segments, segment_durations, staging_dir, 
+                                                           segment_headers, segment_workers, desc)
+                if all(segment_durations):
+                    playlist_duration = sum(segment_durations)
+                input_args = [*FFMPEG_CONCAT_INPUT_ARGS, "-i", concat_list_path]
+            else:
+                # ffmpeg reads the playlist already fetched through the scraper, never the URL
+                # itself, which could fail without the scraper's clearance cookies
+                with tempfile.NamedTemporaryFile("w", suffix=".m3u8", dir=PLAYLIST_TEMP_DIR, 
+                                                 delete=False, encoding="utf-8") as f:
+                    temp_m3u8_path = f.name
+                    # Nothing to rewrite when every URL is already absolute
+                    f.write(m3u8_content if all_absolute else "\n".join(rewritten) + "\n")
+                input_args = [*FFMPEG_PLAYLIST_INPUT_ARGS, "-i", temp_m3u8_path]
+            
             # Build FFmpeg command
-            command = [
-                "ffmpeg",
-                "-protocol_whitelist", "file,http,https,tcp,tls,crypto",
-                "-i", temp_m3u8_path,
-                "-c", "copy",
-                "-bsf:a", "aac_adtstoasc",
-                "-y",
-                destination_path
-            ]
+            command = ["ffmpeg", *input_args, *FFMPEG_OUTPUT_ARGS, destination_path]
             
             logger.debug(f"Executing FFmpeg command: {' '.join(shlex.quote(arg) for arg in command)}")
             
@@ -347,38 +676,119 @@ class FFmpegDownloader(BaseDownloader):
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                universal_newlines=True
+                bufsize=DOWNLOAD_CHUNK_SIZE
             )
             
-            desc = f"Downloading {os.path.basename(destination_path)}"
-            with tqdm(total=total_segments, unit='seg', desc=desc) as pbar:
-                for line in process.stderr:
-                    line = line.strip()
-                    if "Opening 'http" in line and '.ts' in line:
-                        pbar.update(1)
-                    elif "error" in line.lower() or "failed" in line.lower():
-                        logger.error(f"FFmpeg error: {line}")
-                    elif "Duration:" in line:
-                        logger.debug(f"FFmpeg output: {line}")
+            # stderr carries logs and stream details; stdout carries key=value progress
+            stream_info = {}
+            stderr_thread = threading.Thread(
+                target=self._read_stderr, args=(process.stderr, stream_info), daemon=True
+            )
+            stderr_thread.start()
             
-            return_code = process.wait()
+            with tqdm(total=int(playlist_duration) if playlist_duration else None, unit='s', desc=desc) as pbar:
+                for raw in iter(process.stdout.readline, b''):
+                    key, _, value = raw.rstrip().partition(b'=')
+                    # out_time_ms is reported in microseconds, same as out_time_us
+                    if key not in (b'out_time_us', b'out_time_ms'):
+                        continue
+                    try:
+                        out_time_us = int(value)
+                    except ValueError:
+                        continue
+                    stream_info['out_time'] = out_time_us / 1000000
+                    position = out_time_us // 1000000
+                    if pbar.total is None and stream_info.get('duration'):
+                        pbar.total = int(stream_info['duration'])
+                    if position > pbar.n:
+                        pbar.update(position - pbar.n)
             
-            # Cleanup
-            if os.path.exists(temp_m3u8_path):
-                os.remove(temp_m3u8_path)
+            return_code = process.wait()
+            stderr_thread.join()
+            if playlist_duration and not stream_info.get('duration'):
+                stream_info['duration'] = playlist_duration
+            stream_info['returncode'] = return_code
             
             if return_code != 0:
                 logger.error(f"FFmpeg failed with return code {return_code}")
                 return False
+            
+            if stream_info.get('duration'):
+                self.last_metadata = stream_info
                 
             logger.info(f"Successfully completed ffmpeg download to {destination_path}")
             return True
             
         except Exception as e:
             logger.error(f"FFmpeg download failed: {e}")
-            if 'temp_m3u8_path' in locals() and os.path.exists(temp_m3u8_path):
-                os.remove(temp_m3u8_path)
             return False
+        finally:
+            if temp_m3u8_path and os.path.exists(temp_m3u8_path):
+                os.remove(temp_m3u8_path)
+            if staging_dir:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+    
+    @staticmethod
+    def _read_stderr(stream, stream_info: Dict[str, Any]):
+        """Log ffmpeg errors and record the input duration and video resolution"""
+        # Work on raw bytes; only lines that get logged are decoded
+        for raw in iter(stream.readline, b''):
+            if FFMPEG_ERROR_PATTERN.search(raw):
+                logger.error(f"FFmpeg error: {raw.decode('utf-8', 'replace').strip()}")
+            elif b"Duration:" in raw:
+                logger.debug(f"FFmpeg output: {raw.decode('utf-8', 'replace').strip()}")
+                match = FFMPEG_DURATION_PATTERN.search(raw)
+                if match and 'duration' not in stream_info:
+                    hours, minutes, seconds = match.groups()
+                    stream_info['duration'] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+            elif 'resolution' not in stream_info and b"Video:" in raw:
+                match = FFMPEG_RESOLUTION_PATTERN.search(raw)
+                if match:
+                    stream_info['resolution'] = f"{int(match.group(1))}x{int(match.group(2))}"
+    
+    @staticmethod
+    def _segments_fetchable(playlist_lines) -> bool:
+        """Check whether a playlist is a plain media playlist we can fetch ourselves"""
+        for line in playlist_lines:
+            if line.startswith(HLS_FFMPEG_ONLY_TAGS):
+                return False
+            if line.startswith("#EXT-X-KEY") and "METHOD=NONE" not in line:
+                return False
+        return True
+    
+    def _download_segments(self, segments, durations, staging_dir: str, headers: Dict, 
+                           workers: int, desc: str) -> str:
+        """Fetch playlist segments concurrently and return an ffmpeg concat list for them"""
+        paths = [os.path.join(staging_dir, f"{i:06d}.ts") for i in range(len(segments))]
+        
+        def fetch_segment(segment_url: str, path: str):
+            with self.session.get(segment_url, headers=headers, stream=True, timeout=30) as r:
+                r.raise_for_status()
+                with open(path, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+        
+        logger.debug(f"Fetching {len(segments)} segments with {workers} workers")
+        with tqdm(total=len(segments), unit='seg', desc=desc) as pbar:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(fetch_segment, u, p) for u, p in zip(segments, paths)]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                        pbar.update(1)
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        
+        concat_list_path = os.path.join(staging_dir, "segments.txt")
+        with open(concat_list_path, "w", encoding="utf-8") as f:
+            for path, duration in zip(paths, durations):
+                f.write("file '{}'\n".format(path.replace("'", "'\\''")))
+                # Known durations let ffmpeg report a total for the concatenated input
+                if duration:
+                    f.write(f"duration {duration}\n")
+        return concat_list_path
 
 
 class DownloadManager:
@@ -386,6 +796,10 @@ class DownloadManager:
     
     def __init__(self, general_config: Dict[str, Any]):
         self.general_config = general_config
+        self.session = create_http_session()
+        self._metadata_cache = OrderedDict()  # (path, mtime_ns, size) -> metadata
+        self._scraper = None
+        self._page_state = None  # Page currently loaded for MP4/M3U8 detection
         self.downloaders = {
             'requests': RequestsDownloader,
             'curl': CurlDownloader,
@@ -400,7 +814,16 @@ class DownloadManager:
         if not downloader_class:
             logger.error(f"Unknown download method: {method}")
             return None
-        return downloader_class(self.general_config, site_config)
+        if downloader_class is FFmpegDownloader:
+            return downloader_class(self.general_config, site_config, session=self.session, scraper=self.scraper)
+        return downloader_class(self.general_config, site_config, session=self.session)
+    
+    @property
+    def scraper(self):
+        """Shared cloudscraper session for M3U8 fetches, created on first use"""
+        if self._scraper is None:
+            self._scraper = cloudscraper.create_scraper()
+        return self._scraper
     
     def download_file(self, url: str, destination_path: str, method: str, 
                       site_config: Dict[str, Any], headers: Optional[Dict] = None, 
@@ -449,6 +872,9 @@ class DownloadManager:
                 kwargs['impersonate'] = site_config.get("download", {}).get("impersonate", False)
             elif method == 'ffmpeg':
                 kwargs['origin'] = origin
+                kwargs['segment_workers'] = site_config.get("download", {}).get("segment_workers", 1)
+            elif method == 'requests':
+                kwargs['parallel_connections'] = site_config.get("download", {}).get("parallel_connections", 4)
             
             # Execute download
             success = downloader.download(
@@ -461,10 +887,14 @@ class DownloadManager:
             )
             
             if success and os.path.exists(temp_path):
-                # Validate downloaded file
-                video_info = self.get_video_metadata(temp_path)
+                # Validate downloaded file, reusing what the downloader already reported
+                if downloader.last_metadata:
+                    video_info = self._summarize_stream_info(temp_path, downloader.last_metadata)
+                else:
+                    video_info = self.get_video_metadata(temp_path)
                 if video_info:
-                    os.rename(temp_path, destination_path)
+                    from smutscrape.storage import move_file
+                    move_file(temp_path, destination_path)
                     logger.debug(f"Download completed: {os.path.basename(destination_path)}")
                     logger.info(f"Size: {video_info['size_str']} · Duration: {video_info['duration']} · Resolution: {video_info['resolution']}")
                     return True
@@ -488,6 +918,43 @@ class DownloadManager:
     
     def get_video_metadata(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Extract video duration, resolution, and bitrate using ffprobe"""
+        try:
+            st = os.stat(file_path)
+        except OSError as e:
+            logger.error(f"Error extracting metadata for {file_path}: {e}")
+            return None
+        
+        if st.st_size < MIN_VIDEO_SIZE:
+            logger.warning(f"File {file_path} too small ({st.st_size} bytes) to be a video")
+            return None
+        if self._looks_like_text(file_path):
+            logger.warning(f"File {file_path} looks like an HTML/JSON error page, not a video")
+            return None
+        
+        cache_key = (file_path, st.st_mtime_ns, st.st_size)
+        if cache_key in self._metadata_cache:
+            self._metadata_cache.move_to_end(cache_key)
+            return self._metadata_cache[cache_key]
+        
+        video_info = self._probe_video_metadata(file_path)
+        if video_info:
+            self._metadata_cache[cache_key] = video_info
+            if len(self._metadata_cache) > METADATA_CACHE_SIZE:
+                self._metadata_cache.popitem(last=False)
+        return video_info
+    
+    @staticmethod
+    def _looks_like_text(file_path: str) -> bool:
+        """Cheap header sniff for error pages saved in place of a video"""
+        try:
+            with open(file_path, "rb") as f:
+                head = f.read(16).lstrip()
+        except OSError:
+            return False
+        return head.startswith((b"<", b"{"))
+    
+    def _probe_video_metadata(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Run ffprobe and build the metadata summary for a file"""
         command = [
             "ffprobe",
             "-v", "error",
@@ -497,16 +964,14 @@ class DownloadManager:
         ]
         
         try:
-            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, 
-                                  universal_newlines=True, check=True)
-            metadata = json.loads(result.stdout)
+            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+            metadata = json_loads(result.stdout)
             
             # File size in bytes
             file_size = int(metadata.get('format', {}).get('size', os.path.getsize(file_path)))
             
             # Duration in seconds
             duration = float(metadata.get('format', {}).get('duration', 0))
-            duration_str = f"{int(duration // 3600):02d}:{int((duration % 3600) // 60):02d}:{int(duration % 60):02d}"
             
             # Resolution
             streams = metadata.get('streams', [])
@@ -516,26 +981,51 @@ class DownloadManager:
             # Bitrate in kbps
             bitrate = int(metadata.get('format', {}).get('bit_rate', 0)) // 1000 if metadata.get('format', {}).get('bit_rate') else 0
             
-            # Sanity check: reject if file is too small for claimed duration
-            if duration > 0 and file_size / duration < 10240:  # ~10KB/s minimum
-                logger.warning(f"File {file_path} too small ({file_size} bytes) for duration {duration}s")
-                return None
-            
-            return {
-                'size': file_size,
-                'size_str': f"{file_size / 1024 / 1024:.2f} MB",
-                'duration': duration_str,
-                'resolution': resolution,
-                'bitrate': f"{bitrate} kbps" if bitrate else "Unknown"
-            }
+            return self._summarize_video(file_path, file_size, duration, resolution, bitrate)
             
         except subprocess.CalledProcessError as e:
-            logger.error(f"ffprobe failed for {file_path}: {e.stderr}")
+            logger.error(f"ffprobe failed for {file_path}: {e.stderr.decode('utf-8', 'replace')}")
             return None
         except Exception as e:
             logger.error(f"Error extracting metadata for {file_path}: {e}")
             return None
     
+    def _summarize_stream_info(self, file_path: str, stream_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Build the metadata summary from details a downloader captured, without ffprobe.
+        
+        Those details describe the input, so the output is still probed when the tool
+        failed, stopped short of the input duration, or the data rate is borderline.
+        """
+        file_size = os.path.getsize(file_path)
+        duration = stream_info['duration']
+        if (stream_info.get('returncode', 0) != 0
+                or stream_info.get('out_time', 0) < duration - STREAM_INFO_DURATION_TOLERANCE
+                or file_size < duration * MIN_VIDEO_BYTE_RATE * STREAM_INFO_RATE_MARGIN):
+            logger.debug(f"Reported stream details unreliable for {file_path}; probing output")
+            return self.get_video_metadata(file_path)
+        bitrate = int(file_size * 8 / duration / 1000) if duration else 0
+        return self._summarize_video(file_path, file_size, duration, 
+                                     stream_info.get('resolution') or "Unknown", bitrate)
+    
+    @staticmethod
+    def _summarize_video(file_path: str, file_size: int, duration: float, 
+                         resolution: str, bitrate: int) -> Optional[Dict[str, Any]]:
+        """Format video details, rejecting files too small for their duration"""
+        # Sanity check: reject if file is too small for claimed duration
+        if duration > 0 and file_size / duration < MIN_VIDEO_BYTE_RATE:
+            logger.warning(f"File {file_path} too small ({file_size} bytes) for duration {duration}s")
+            return None
+        
+        duration_str = f"{int(duration // 3600):02d}:{int((duration % 3600) // 60):02d}:{int(duration % 60):02d}"
+        return {
+            'size': file_size,
+            'size_str': f"{file_size / 1024 / 1024:.2f} MB",
+            'duration': duration_str,
+            'resolution': resolution,
+            'bitrate': f"{bitrate} kbps" if bitrate else "Unknown"
+        }
+    
     def process_fallback_download(self, url: str, overwrite: bool = False):
         """
         Fallback download using yt-dlp and direct detection for unsupported sites.
@@ -556,7 +1046,12 @@ class DownloadManager:
         
         if not success or not downloaded_files:
             logger.warning(f"yt-dlp fallback failed for {url}. Attempting direct detection fallback.")
-            if self._fallback_detect_and_download(url, overwrite):
+            try:
+                detected = self._fallback_detect_and_download(url, overwrite)
+            finally:
+                # The shared driver will be used elsewhere; never reuse this page on a later call
+                self._page_state = None
+            if detected:
                 logger.info(f"Direct detection fallback succeeded for {url}")
                 # If _fallback_detect_and_download created the temp_dir or used it, 
                 # it should clean up its own specific temp files.
@@ -572,24 +1067,27 @@ class DownloadManager:
         # This part below only runs if yt-dlp succeeded initially
         logger.info(f"yt-dlp fallback succeeded for {url}, processing {len(downloaded_files)} files.")
         # Import storage manager here to avoid circular imports
-        from smutscrape.storage import get_storage_manager
+        from smutscrape.storage import get_storage_manager, move_file
+        storage_manager = get_storage_manager(self.general_config)
+        destination_type = destination_config['type']
+        destination_dir = destination_config['path']
+        if destination_type == 'local':
+            os.makedirs(destination_dir, exist_ok=True)
         
         for downloaded_file in downloaded_files:
             source_path = os.path.join(temp_dir, downloaded_file)
-            if destination_config['type'] == 'smb':
-                smb_destination_path = os.path.join(destination_config['path'], downloaded_file)
-                if not overwrite and get_storage_manager().file_exists_on_smb(destination_config, smb_destination_path):
+            final_path = os.path.join(destination_dir, downloaded_file)
+            if destination_type == 'smb':
+                if not overwrite and storage_manager.file_exists_on_smb(destination_config, final_path):
                     logger.info(f"File '{downloaded_file}' exists on SMB. Skipping.")
                     continue
-                get_storage_manager().upload_to_smb(source_path, smb_destination_path, destination_config)
-            elif destination_config['type'] == 'local':
-                final_path = os.path.join(destination_config['path'], downloaded_file)
+                storage_manager.upload_to_smb(source_path, final_path, destination_config)
+            elif destination_type == 'local':
                 if not overwrite and os.path.exists(final_path):
                     logger.info(f"File '{downloaded_file}' exists locally. Skipping.")
                     continue
-                os.makedirs(os.path.dirname(final_path), exist_ok=True)
-                shutil.move(source_path, final_path)
-                get_storage_manager().apply_permissions(final_path, destination_config)
+                move_file(source_path, final_path)
+                storage_manager.apply_permissions(final_path, destination_config)
         shutil.rmtree(temp_dir, ignore_errors=True)
         return True
     
@@ -605,8 +1103,7 @@ class DownloadManager:
         # Import here to avoid circular imports
         try:
             from config import get_config_manager
-            from smutscrape.utilities import is_url
-            from smutscrape.storage import get_storage_manager
+            from smutscrape.storage import get_storage_manager, move_file
         except ImportError as e:
             logger.error(f"Fallback: Failed to import required modules: {e}")
             return False
@@ -621,7 +1118,7 @@ class DownloadManager:
             current_url_for_scan = url
             # Simplified iframe check for fallback
             try:
-                driver.get(url) # Load the initial URL first
+                self._load_page(driver, url) # Load the initial URL first
                 time.sleep(random.uniform(2,4)) # Allow page to load and scripts to potentially run
                 iframes = driver.find_elements(By.TAG_NAME, "iframe")
                 if iframes:
@@ -674,11 +1171,9 @@ class DownloadManager:
             return False
 
         title_from_url_path = url.split('/')[-1].split('?')[0] if '/' in url else url
-        title = re.sub(r'[^a-zA-Z0-9_.-]', '_', title_from_url_path) or "fallback_video"
+        title = TITLE_SANITIZE_PATTERN.sub('_', title_from_url_path) or "fallback_video"
         invalid_chars = self.general_config['file_naming']['invalid_chars']
         
-        # Import process_title here to avoid circular imports
-        from smutscrape.utilities import process_title, construct_filename
         processed_title = process_title(title, invalid_chars)
         
         filename = construct_filename(processed_title, {}, self.general_config) # Use empty site_config for basic construction
@@ -702,27 +1197,27 @@ class DownloadManager:
         )
 
         if success:
+            storage_manager = get_storage_manager(self.general_config)
             final_filename_at_destination = filename # This is the desired final name, not the temp one.
+            final_path = os.path.join(destination_config['path'], final_filename_at_destination)
             if destination_config['type'] == 'smb':
-                smb_final_path = os.path.join(destination_config['path'], final_filename_at_destination)
-                if not overwrite and get_storage_manager().file_exists_on_smb(destination_config, smb_final_path):
+                if not overwrite and storage_manager.file_exists_on_smb(destination_config, final_path):
                     logger.info(f"Fallback: File '{final_filename_at_destination}' exists on SMB. Skipping upload.")
                     os.remove(local_temp_path) # Clean up temp file
                     return True
-                get_storage_manager().upload_to_smb(local_temp_path, smb_final_path, destination_config, overwrite)
+                storage_manager.upload_to_smb(local_temp_path, final_path, destination_config, overwrite)
                 os.remove(local_temp_path)
-                logger.success(f"Fallback: Uploaded detected video to SMB: {smb_final_path}")
+                logger.success(f"Fallback: Uploaded detected video to SMB: {final_path}")
                 return True
             elif destination_config['type'] == 'local':
-                local_final_storage_path = os.path.join(destination_config['path'], final_filename_at_destination)
-                if not overwrite and os.path.exists(local_final_storage_path):
+                if not overwrite and os.path.exists(final_path):
                     logger.info(f"Fallback: File '{final_filename_at_destination}' exists locally. Skipping move.")
                     os.remove(local_temp_path) # Clean up temp file
                     return True
-                os.makedirs(os.path.dirname(local_final_storage_path), exist_ok=True)
-                shutil.move(local_temp_path, local_final_storage_path)
-                get_storage_manager().apply_permissions(local_final_storage_path, destination_config)
-                logger.success(f"Fallback: Moved detected video to local destination: {local_final_storage_path}")
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                move_file(local_temp_path, final_path)
+                storage_manager.apply_permissions(final_path, destination_config)
+                logger.success(f"Fallback: Moved detected video to local destination: {final_path}")
                 return True
         else:
             logger.error(f"Fallback: Download of detected video failed for {video_url_detected}")
@@ -730,37 +1225,68 @@ class DownloadManager:
                 os.remove(local_temp_path)
         return False
     
+    def _load_page(self, driver, url) -> Dict[str, Any]:
+        """Navigate to url unless the driver still shows the page loaded for it, and return its page state"""
+        page = self._page_state
+        if (page is None or page['driver'] is not driver or page['url'] != url
+                or driver.current_url != page['current_url']):
+            install_xhr_hook(driver)
+            driver.get(url)
+            page = self._page_state = {'driver': driver, 'url': url, 'current_url': driver.current_url,
+                                       'logs': [], 'settled': False}
+        return page
+    
+    def _collect_performance_logs(self, driver, page: Dict[str, Any], marker: str) -> list:
+        """
+        Return every performance log entry seen for the loaded page, waiting until
+        responses whose URL contains marker stop arriving (or the timeout passes).
+        """
+        def has_match(entries):
+            return any("Network.responseReceived" in e["message"] and marker in e["message"] for e in entries)
+        
+        # get_log drains the browser buffer, so keep entries for later extractors
+        page['logs'].extend(driver.get_log("performance"))
+        if page['settled']:
+            return page['logs']
+        
+        start = time.monotonic()
+        last_match = start if has_match(page['logs']) else None
+        while True:
+            now = time.monotonic()
+            if now - start >= DETECTION_TIMEOUT:
+                page['settled'] = True
+                break
+            if last_match is not None and now - last_match >= DETECTION_QUIET_PERIOD:
+                break
+            time.sleep(DETECTION_POLL_INTERVAL)
+            entries = driver.get_log("performance")
+            page['logs'].extend(entries)
+            if has_match(entries):
+                last_match = time.monotonic()
+        
+        logger.debug(f"Waited {time.monotonic() - start:.1f}s for '{marker}' responses")
+        return page['logs']
+    
     def _extract_mp4_urls(self, driver, url):
         """Extract MP4 URLs from network traffic"""
         logger.debug(f"Extracting MP4 URLs from: {url}")
-        driver.get(url)
-
-        driver.execute_script("""
-            (function() {
-                let open = XMLHttpRequest.prototype.open;
-                XMLHttpRequest.prototype.open = function(method, url) {
-                    if (url.includes(".mp4")) {
-                        console.log("🔥 Found MP4 via XHR:", url);
-                    }
-                    return open.apply(this, arguments);
-                };
-            })();
-        """)
-
-        time.sleep(5) # Wait for network requests
-
-        logs = driver.get_log("performance")
+        page = self._load_page(driver, url)
+
+        logs = self._collect_performance_logs(driver, page, ".mp4")
         mp4_urls = []
         logger.debug(f"Analyzing {len(logs)} performance logs for MP4s")
         for log in logs:
+            raw = log["message"]
+            # Only parse entries that could be a matching response
+            if "Network.responseReceived" not in raw or ".mp4" not in raw:
+                continue
             try:
-                message = json.loads(log["message"])["message"]
+                message = json_loads(raw)["message"]
                 if "Network.responseReceived" in message["method"]:
                     request_url = message["params"]["response"]["url"]
                     if ".mp4" in request_url:
                         # Basic quality check - prefer URLs with typical video resolution patterns
-                        if re.search(r'(240|360|480|720|1080|1440|2160)p', request_url.lower()) or \
-                           re.search(r'(\d{3,4}x\d{3,4})', request_url.lower()):
+                        if MP4_QUALITY_HINT_PATTERN.search(request_url):
                             mp4_urls.append(request_url)
                             logger.debug(f"Found MP4 URL (likely video): {request_url}")
                         else:
@@ -773,23 +1299,9 @@ class DownloadManager:
             return None, None
 
         # Prioritize higher resolution if discernible from URL
-        def quality_key(url_str):
-            resolutions = {"2160p": 6, "1440p": 5, "1080p": 4, "720p": 3, "480p": 2, "360p": 1, "240p": 0}
-            for res, score in resolutions.items():
-                if res in url_str:
-                    return score
-            # Try to extract resolution like 1920x1080
-            match = re.search(r'(\d+)x(\d+)', url_str)
-            if match:
-                try:
-                    return int(match.group(2)) # Sort by height
-                except ValueError:
-                    pass
-            return -1 # Lowest priority if no clear resolution
-
-        best_mp4 = sorted(mp4_urls, key=quality_key, reverse=True)[0]
+        best_mp4 = max(mp4_urls, key=resolution_score)
         cookies_list = driver.get_cookies()
-        cookies_str = "; ".join([f"{c['name']}={c['value']}" for c in cookies_list])
+        cookies_str = "; ".join(f"{name}={value}" for name, value in map(COOKIE_FIELDS, cookies_list))
         logger.debug(f"Cookies after MP4 detection: {cookies_str if cookies_str else 'None'}")
         logger.info(f"Selected best MP4: {best_mp4}")
         return best_mp4, cookies_str
@@ -797,28 +1309,18 @@ class DownloadManager:
     def _extract_m3u8_urls(self, driver, url):
         """Extract M3U8 URLs from network traffic"""
         logger.debug(f"Extracting M3U8 URLs from: {url}")
-        driver.get(url)  # Redundant but ensures we're on the right page
-        
-        driver.execute_script("""
-            (function() {
-                let open = XMLHttpRequest.prototype.open;
-                XMLHttpRequest.prototype.open = function(method, url) {
-                    if (url.includes(".m3u8")) {
-                        console.log("🔥 Found M3U8 via XHR:", url);
-                    }
-                    return open.apply(this, arguments);
-                };
-            })();
-        """)
-
-        time.sleep(5)
-        
-        logs = driver.get_log("performance")
+        page = self._load_page(driver, url)
+
+        logs = self._collect_performance_logs(driver, page, ".m3u8")
         m3u8_urls = []
         logger.debug(f"Analyzing {len(logs)} performance logs")
         for log in logs:
+            raw = log["message"]
+            # Only parse entries that could be a matching response
+            if "Network.responseReceived" not in raw or ".m3u8" not in raw:
+                continue
             try:
-                message = json.loads(log["message"])["message"]
+                message = json_loads(raw)["message"]
                 if "Network.responseReceived" in message["method"]:
                     request_url = message["params"]["response"]["url"]
                     if ".m3u8" in request_url:
@@ -831,9 +1333,9 @@ class DownloadManager:
             logger.warning("No M3U8 URLs detected in network traffic")
             return None, None
         
-        best_m3u8 = sorted(m3u8_urls, key=lambda u: "1920x1080" in u, reverse=True)[0]
+        best_m3u8 = max(m3u8_urls, key=resolution_score)
         cookies_list = driver.get_cookies()
-        cookies_str = "; ".join([f"{c['name']}={c['value']}" for c in cookies_list])
+        cookies_str = "; ".join(f"{name}={value}" for name, value in map(COOKIE_FIELDS, cookies_list))
         logger.debug(f"Cookies after load: {cookies_str if cookies_str else 'None'}")
         logger.info(f"Selected best M3U8: {best_m3u8}")
         return best_m3u8, cookies_str
@@ -859,37 +1361,50 @@ def download_with_ytdlp_fallback(url: str, temp_dir: str, general_config: Dict[s
     Returns:
         Tuple of (success, list of downloaded files)
     """
-    command = f"yt-dlp --paths {temp_dir} --format best --add-metadata"
+    # --print implies --quiet, so ask for progress explicitly
+    command = ["yt-dlp", "--paths", temp_dir, "--format", "best", "--add-metadata",
+               "--print", f"after_move:{YTDLP_FILEPATH_PREFIX}%(filepath)s", "--progress",
+               "--concurrent-fragments", str(general_config.get('yt_dlp_concurrency', 5)),
+               "--http-chunk-size", "10M"]
+    if shutil.which('aria2c'):
+        # Multi-connection range downloads for non-fragmented files
+        command += ["--downloader", "http:aria2c", "--downloader-args", "aria2c:-x 8 -s 8 -k 1M"]
     if general_config.get('user_agents'):
-        command += f" --user-agent \"{random.choice(general_config['user_agents'])}\""
-    command += f" \"{url}\""
+        command += ["--user-agent", random.choice(general_config['user_agents'])]
+    command.append(url)
+    logger.debug(f"Executing yt-dlp command: {' '.join(shlex.quote(arg) for arg in command)}")
     
-    process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, 
-                              stderr=subprocess.STDOUT, universal_newlines=True, cwd=temp_dir)
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, 
+                              stderr=subprocess.STDOUT, text=True, bufsize=1, cwd=temp_dir)
     
-    progress_regex = re.compile(r'\[download\]\s+(\d+\.\d+)% of ~?\s*(\d+\.\d+)(K|M|G)iB')
-    filename_regex = re.compile(r'\[download\] Destination: (.+)')
     downloaded_files = []
     total_size = None
     pbar = None
     
     try:
-        for line in process.stdout:
-            filename_match = filename_regex.search(line)
-            if filename_match:
-                filename = os.path.basename(filename_match.group(1))
-                if filename not in downloaded_files:
+        for line in iter_process_lines(process.stdout):
+            if line.startswith(YTDLP_FILEPATH_PREFIX):
+                filename = os.path.basename(line[len(YTDLP_FILEPATH_PREFIX):].strip())
+                if filename and filename not in downloaded_files:
                     downloaded_files.append(filename)
-                    
-            progress_match = progress_regex.search(line)
-            if progress_match:
-                percent, size, size_unit = progress_match.groups()
-                if total_size is None:
-                    total_size = float(size) * {'K': 1024, 'M': 1024**2, 'G': 1024**3}[size_unit]
-                    pbar = tqdm(total=total_size, unit='B', unit_scale=True, desc="Downloading")
-                progress = float(percent) * total_size / 100
-                if pbar:
-                    pbar.update(progress - pbar.n)
+            elif '[download]' in line:
+                progress_match = YTDLP_PROGRESS_PATTERN.search(line)
+                if progress_match:
+                    percent, size, size_unit = progress_match.groups()
+                    if total_size is None:
+                        total_size = float(size) * SIZE_UNITS[size_unit]
+                        pbar = tqdm(total=total_size, unit='B', unit_scale=True, desc="Downloading")
+                    progress = float(percent) * total_size / 100
+                    if pbar:
+                        pbar.update(progress - pbar.n)
+            elif line.startswith('[#'):
+                aria2c_match = ARIA2C_PROGRESS_PATTERN.search(line)
+                if aria2c_match:
+                    done, done_unit, size, size_unit = aria2c_match.groups()
+                    if pbar is None:
+                        total_size = float(size) * SIZE_UNITS[size_unit]
+                        pbar = tqdm(total=total_size, unit='B', unit_scale=True, desc="Downloading")
+                    pbar.update(float(done) * SIZE_UNITS[done_unit] - pbar.n)
             logger.debug(line.strip())
             
     except KeyboardInterrupt:
@@ -902,7 +1417,4 @@ def download_with_ytdlp_fallback(url: str, temp_dir: str, general_config: Dict[s
         pbar.close()
         
     success = process.wait() == 0
-    if success and not downloaded_files:
-        downloaded_files = os.listdir(temp_dir)
-        
     return success and downloaded_files, downloaded_files 
\ No newline at end of file
@@ -8,9 +8,10 @@ This module provides functionality for generating NFO files and managing metadat
 import os
 import re
 import yaml
+from xml.sax.saxutils import escape
 from typing import Dict, Any, Optional
 from loguru import logger
-from smutscrape.utilities import custom_title_case
+from smutscrape.utilities import custom_title_case_cached
 
 
 # ============================================================================
@@ -19,8 +20,9 @@ from smutscrape.utilities import custom_title_case
 
 def finalize_metadata(metadata: Dict[str, Any], general_config: Dict[str, Any]) -> Dict[str, Any]:
     """Finalize metadata: deduplicate across fields, apply capitalization rules."""
-    case_overrides = general_config.get('case_overrides', [])
-    tag_case_overrides = general_config.get('tag_case_overrides', [])
+    # Tuples so the overrides can key the title-case cache
+    case_overrides = tuple(general_config.get('case_overrides', []))
+    tag_case_overrides = tuple(general_config.get('tag_case_overrides', []))
     tag_overrides = case_overrides + tag_case_overrides  # Combine for tags
     
     final_metadata = metadata.copy()
@@ -30,20 +32,21 @@ def finalize_metadata(metadata: Dict[str, Any], general_config: Dict[str, Any])
     studios = [studio.lstrip('#') for studio in final_metadata.get('studios', []) if studio and studio.strip() != "and"]
     tags = [tag.lstrip('#') for tag in final_metadata.get('tags', []) if tag and tag.strip() != "and"]
     
-    # Deduplicate: Actors > Studios > Tags
-    actors_lower = set(a.lower() for a in actors)
-    studios = [s for s in studios if s.lower() not in actors_lower]
-    studios_lower = set(s.lower() for s in studios)
-    tags = [t for t in tags if t.lower() not in actors_lower and t.lower() not in studios_lower]
+    # Deduplicate: Actors > Studios > Tags (lowercasing each value once)
+    actors_lower = frozenset(a.lower() for a in actors)
+    studio_pairs = [(s, sl) for s, sl in ((s, s.lower()) for s in studios) if sl not in actors_lower]
+    studios = [s for s, _ in studio_pairs]
+    seen_lower = actors_lower.union(sl for _, sl in studio_pairs)
+    tags = [t for t in tags if t.lower() not in seen_lower]
     
     # Apply capitalization
-    final_metadata['actors'] = [custom_title_case(a, case_overrides, preserve_mixed_case=True) for a in actors]
-    final_metadata['studios'] = [custom_title_case(s, case_overrides, preserve_mixed_case=True) for s in studios]
-    final_metadata['tags'] = [custom_title_case(t, tag_overrides) for t in tags]
+    final_metadata['actors'] = [custom_title_case_cached(a, case_overrides, preserve_mixed_case=True) for a in actors]
+    final_metadata['studios'] = [custom_title_case_cached(s, case_overrides, preserve_mixed_case=True) for s in studios]
+    final_metadata['tags'] = [custom_title_case_cached(t, tag_overrides) for t in tags]
     if 'title' in final_metadata and final_metadata['title']:
-        final_metadata['title'] = custom_title_case(final_metadata['title'].strip(), case_overrides)
+        final_metadata['title'] = custom_title_case_cached(final_metadata['title'].strip(), case_overrides)
     if 'studio' in final_metadata and final_metadata['studio']:
-        final_metadata['studio'] = custom_title_case(final_metadata['studio'].lstrip('#'), case_overrides, preserve_mixed_case=True)
+        final_metadata['studio'] = custom_title_case_cached(final_metadata['studio'].lstrip('#'), case_overrides, preserve_mixed_case=True)
     
     # Log the final values for each field in the metadata
     for field in final_metadata:
@@ -66,43 +69,51 @@ def generate_nfo(destination_path: str, metadata: Dict[str, Any], overwrite: boo
     # Compute NFO file path
     nfo_path = f"{destination_path.rsplit('.', 1)[0]}.nfo"
 
-    # Check if NFO exists and respect overwrite flag
-    if os.path.exists(nfo_path) and not overwrite:
-        logger.debug(f"NFO exists at {nfo_path}. Skipping generation.")
-        return True
-
     try:
-        # Write the NFO file
-        with open(nfo_path, 'w', encoding='utf-8') as f:
-            f.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
-            f.write('<movie>\n')
+        # Create the file exclusively so an existing NFO is detected by the open itself
+        replaced = False
+        try:
+            f = open(nfo_path, 'xb')
+        except FileExistsError:
+            if not overwrite:
+                logger.debug(f"NFO exists at {nfo_path}. Skipping generation.")
+                return True
+            f = open(nfo_path, 'wb')
+            replaced = True
+
+        with f:
+            # Build the NFO document, escaping every value for XML
+            parts = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<movie>\n']
             if 'title' in metadata and metadata['title']:
-                f.write(f"  <title>{metadata['title']}</title>\n")
+                parts.append(f"  <title>{escape(str(metadata['title']))}</title>\n")
             if 'url' in metadata and metadata['url']:
-                f.write(f"  <url>{metadata['url']}</url>\n")
+                parts.append(f"  <url>{escape(str(metadata['url']))}</url>\n")
             if 'date' in metadata and metadata['date']:
-                f.write(f"  <premiered>{metadata['date']}</premiered>\n")
+                parts.append(f"  <premiered>{escape(str(metadata['date']))}</premiered>\n")
             if 'Code' in metadata and metadata['Code']:
-                f.write(f"  <uniqueid>{metadata['Code']}</uniqueid>\n")
+                parts.append(f"  <uniqueid>{escape(str(metadata['Code']))}</uniqueid>\n")
             if 'tags' in metadata and metadata['tags']:
-                for tag in metadata['tags']:
-                    f.write(f"  <tag>{tag}</tag>\n")
+                parts.extend(f"  <tag>{escape(str(tag))}</tag>\n" for tag in metadata['tags'])
             if 'actors' in metadata and metadata['actors']:
-                for i, performer in enumerate(metadata['actors'], 1):
-                    f.write(f"  <actor>\n    <name>{performer}</name>\n    <order>{i}</order>\n  </actor>\n")
+                parts.extend(
+                    f"  <actor>\n    <name>{escape(str(performer))}</name>\n    <order>{i}</order>\n  </actor>\n"
+                    for i, performer in enumerate(metadata['actors'], 1)
+                )
             if 'Image' in metadata and metadata['Image']:
-                f.write(f"  <thumb aspect=\"poster\">{metadata['Image']}</thumb>\n")
+                parts.append(f"  <thumb aspect=\"poster\">{escape(str(metadata['Image']))}</thumb>\n")
             if 'studios' in metadata and metadata['studios']:
-                for studio in metadata['studios']:
-                    f.write(f"  <studio>{studio}</studio>\n")
+                parts.extend(f"  <studio>{escape(str(studio))}</studio>\n" for studio in metadata['studios'])
             elif 'studio' in metadata and metadata['studio']:
-                f.write(f"  <studio>{metadata['studio']}</studio>\n")
+                parts.append(f"  <studio>{escape(str(metadata['studio']))}</studio>\n")
             if 'description' in metadata and metadata['description']:
-                f.write(f"  <plot>{metadata['description']}</plot>\n")
-            f.write('</movie>\n')
+                parts.append(f"  <plot>{escape(str(metadata['description']))}</plot>\n")
+            parts.append('</movie>\n')
+
+            # Write the NFO file in a single call
+            f.write(''.join(parts).encode('utf-8'))
 
         # Log success
-        logger.success(f"{'Replaced' if os.path.exists(nfo_path) else 'Generated'} NFO at {nfo_path}")
+        logger.success(f"{'Replaced' if replaced else 'Generated'} NFO at {nfo_path}")
         return True
 
     except Exception as e:
@@ -3,12 +3,87 @@
 Domain models for the smutscrape application.
 """
 
+import os
+import sys
+import hashlib
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Set
 from datetime import datetime
 
+# Number of appended URLs after which the state file is compacted
+STATE_COMPACT_INTERVAL = 10000
+# Bytes of blake2b digest kept per processed URL
+URL_DIGEST_SIZE = 16
+# Block size used when streaming a state file into a ProcessedIndex
+STATE_READ_BLOCK_SIZE = 1 << 20
+# Drop the per-instance __dict__ on Python versions whose dataclasses support it
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+# (attribute, key) pairs copied into VideoMetadata.to_nfo_dict
+NFO_FIELD_MAP = (
+    ('title', 'title'), ('url', 'url'), ('date', 'date'), ('code', 'Code'),
+    ('description', 'description'), ('image', 'Image'), ('actors', 'actors'),
+    ('studios', 'studios'), ('tags', 'tags'),
+)
+# ScrapedVideo attributes included in to_dict only when set
+SCRAPED_VIDEO_OPTIONAL_FIELDS = ('thumbnail', 'duration', 'video_key')
 
-@dataclass
+
+def url_digest(url) -> bytes:
+    """Return the fixed-size digest used to remember a processed URL"""
+    if isinstance(url, str):
+        url = url.encode('utf-8')
+    return hashlib.blake2b(url, digest_size=URL_DIGEST_SIZE).digest()
+
+
+class ProcessedIndex:
+    """
+    Set-like record of processed URLs that stores only their digests.
+    
+    Supports `in`, `add` and `len` so it can stand in for the plain URL sets
+    passed around as state_set. URLs cannot be listed back out; the state file
+    remains the human-readable record.
+    """
+    
+    __slots__ = ('_digests',)
+    
+    def __init__(self, urls: Iterable[str] = ()):
+        self._digests: Set[bytes] = set()
+        for url in urls:
+            self.add(url)
+    
+    def add(self, url: str):
+        """Mark a URL as processed"""
+        self._digests.add(url_digest(url))
+    
+    def __contains__(self, url) -> bool:
+        return url_digest(url) in self._digests
+    
+    def __len__(self) -> int:
+        return len(self._digests)
+    
+    def __repr__(self) -> str:
+        return f"ProcessedIndex({len(self._digests)} urls)"
+    
+    @classmethod
+    def from_file(cls, file_path: str) -> 'ProcessedIndex':
+        """Build an index from a state file with one URL per line"""
+        index = cls()
+        digests = index._digests
+        tail = b''
+        with open(file_path, 'rb') as f:
+            while True:
+                block = f.read(STATE_READ_BLOCK_SIZE)
+                if not block:
+                    break
+                lines = (tail + block).split(b'\n')
+                tail = lines.pop()
+                digests.update(url_digest(line.strip()) for line in lines if line.strip())
+        if tail.strip():
+            digests.add(url_digest(tail.strip()))
+        return index
+
+
+@dataclass(**DATACLASS_OPTIONS)
 class VideoMetadata:
     """Represents metadata for a video"""
     title: str
@@ -29,18 +104,9 @@ class VideoMetadata:
     
     def to_nfo_dict(self) -> Dict[str, Any]:
         """Convert to dictionary suitable for NFO generation"""
-        return {
-            'title': self.title,
-            'url': self.url,
-            'date': self.date,
-            'Code': self.code,
-            'description': self.description,
-            'Image': self.image,
-            'actors': self.actors,
-            'studios': self.studios,
-            'tags': self.tags,
-            'studio': self.studios[0] if self.studios else None
-        }
+        result = {key: getattr(self, attr) for attr, key in NFO_FIELD_MAP}
+        result['studio'] = self.studios[0] if self.studios else None
+        return result
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'VideoMetadata':
@@ -64,7 +130,7 @@ class VideoMetadata:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class DownloadJob:
     """Represents a single download job"""
     url: str
@@ -81,16 +147,20 @@ class DownloadJob:
             self.method = self.site_config.download.method
 
 
-@dataclass 
+@dataclass(**DATACLASS_OPTIONS)
 class ProcessingState:
     """Tracks the state of processing"""
-    processed_urls: set = field(default_factory=set)
+    processed_urls: ProcessedIndex = field(default_factory=ProcessedIndex)
     current_page: int = 1
     video_offset: int = 0
+    _pending: List[str] = field(default_factory=list, repr=False)
+    _appended: int = field(default=0, repr=False)
     
     def mark_processed(self, url: str):
         """Mark a URL as processed"""
-        self.processed_urls.add(url)
+        if url not in self.processed_urls:
+            self.processed_urls.add(url)
+            self._pending.append(url)
     
     def is_processed(self, url: str) -> bool:
         """Check if a URL has been processed"""
@@ -106,23 +176,40 @@ class ProcessingState:
         """Load processing state from a file"""
         state = cls()
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    url = line.strip()
-                    if url:
-                        state.processed_urls.add(url)
+            state.processed_urls = ProcessedIndex.from_file(file_path)
         except FileNotFoundError:
             pass
         return state
     
-    def save_to_file(self, file_path: str):
-        """Save processing state to a file"""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for url in sorted(self.processed_urls):
-                f.write(f"{url}\n")
+    def flush_to_file(self, file_path: str):
+        """Append newly processed URLs to the state file"""
+        if not self._pending:
+            return
+        with open(file_path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(self._pending) + '\n')
+        self._appended += len(self._pending)
+        self._pending.clear()
+        if self._appended >= STATE_COMPACT_INTERVAL:
+            self.compact(file_path)
+    
+    def compact(self, file_path: str):
+        """Rewrite the state file as a sorted, de-duplicated list"""
+        # Only digests are kept in memory, so the URLs come from the file itself
+        urls = set(self._pending)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                urls.update(line.strip() for line in f.read().splitlines() if line.strip())
+        except FileNotFoundError:
+            pass
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(f"{url}\n" for url in sorted(urls)))
+        os.replace(tmp_path, file_path)
+        self._pending.clear()
+        self._appended = 0
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ScrapedVideo:
     """Represents a video scraped from a list page"""
     title: str
@@ -134,21 +221,14 @@ class ScrapedVideo:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        result = {
-            'title': self.title,
-            'url': self.url
-        }
-        if self.thumbnail:
-            result['thumbnail'] = self.thumbnail
-        if self.duration:
-            result['duration'] = self.duration
-        if self.video_key:
-            result['video_key'] = self.video_key
-        result.update(self.additional_data)
+        result = {'title': self.title, 'url': self.url}
+        result.update((key, value) for key in SCRAPED_VIDEO_OPTIONAL_FIELDS if (value := getattr(self, key)))
+        if self.additional_data:
+            result.update(self.additional_data)
         return result
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class PageResult:
     """Results from processing a single page"""
     videos: List[ScrapedVideo] = field(default_factory=list)
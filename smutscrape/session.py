@@ -7,8 +7,18 @@ This module handles state file operations, progress tracking, and session manage
 
 import os
 import time
-from typing import Set, Optional
+import atexit
+import threading
+from typing import Optional
 from loguru import logger
+from smutscrape.models import ProcessedIndex
+
+# Number of appended URLs buffered before the state file is flushed
+STATE_FLUSH_INTERVAL = 50
+# Seconds after the last flush at which the next append flushes regardless of count.
+# Checked only on append: entries from a run that goes idle wait for the next
+# append, flush() or close() (at the latest, at interpreter exit).
+STATE_FLUSH_SECONDS = 5.0
 
 
 class SessionManager:
@@ -21,29 +31,34 @@ class SessionManager:
             state_file_path: Path to the state file for tracking processed URLs
         """
         self.state_file = state_file_path
-        self.processed_urls: Set[str] = set()
+        self.processed_urls = ProcessedIndex()
         self.last_vpn_action_time = 0
+        self._state_handle = None
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        # Guards the shared append handle; API worker threads save state concurrently
+        self._state_lock = threading.RLock()
         
         # Load existing state
         self.load_state()
+        atexit.register(self.close)
     
-    def load_state(self) -> Set[str]:
+    def load_state(self) -> ProcessedIndex:
         """Load processed video URLs from state file.
         
         Returns:
-            Set of processed URLs
+            Index of processed URLs
         """
         if not os.path.exists(self.state_file):
-            self.processed_urls = set()
+            self.processed_urls = ProcessedIndex()
             return self.processed_urls
         
         try:
-            with open(self.state_file, 'r', encoding='utf-8') as f:
-                self.processed_urls = set(line.strip() for line in f if line.strip())
+            self.processed_urls = ProcessedIndex.from_file(self.state_file)
             logger.debug(f"Loaded {len(self.processed_urls)} URLs from state file")
         except Exception as e:
             logger.error(f"Failed to load state file '{self.state_file}': {e}")
-            self.processed_urls = set()
+            self.processed_urls = ProcessedIndex()
         
         return self.processed_urls
     
@@ -54,13 +69,48 @@ class SessionManager:
             url: URL to mark as processed
         """
         try:
-            with open(self.state_file, 'a', encoding='utf-8') as f:
-                f.write(f"{url}\n")
-            self.processed_urls.add(url)
+            with self._state_lock:
+                if self._state_handle is None:
+                    self._state_handle = open(self.state_file, 'a', buffering=1 << 16, encoding='utf-8')
+                self._state_handle.write(f"{url}\n")
+                self.processed_urls.add(url)
+                
+                self._unflushed += 1
+                if (self._unflushed >= STATE_FLUSH_INTERVAL
+                        or time.monotonic() - self._last_flush >= STATE_FLUSH_SECONDS):
+                    self.flush()
             logger.debug(f"Added URL to state: {url}")
         except Exception as e:
             logger.error(f"Failed to append to state file '{self.state_file}': {e}")
     
+    def flush(self):
+        """Write any buffered state entries to disk.
+        
+        Appends flush themselves every STATE_FLUSH_INTERVAL entries or STATE_FLUSH_SECONDS;
+        call this when a run finishes or pauses so the last entries don't wait for more.
+        """
+        with self._state_lock:
+            if self._state_handle is not None:
+                try:
+                    self._state_handle.flush()
+                except Exception as e:
+                    logger.error(f"Failed to flush state file '{self.state_file}': {e}")
+            self._unflushed = 0
+            self._last_flush = time.monotonic()
+    
+    def close(self):
+        """Flush and close the state file handle."""
+        # Closed sessions no longer need closing at exit, and atexit would otherwise keep them alive
+        atexit.unregister(self.close)
+        with self._state_lock:
+            if self._state_handle is not None:
+                self.flush()
+                try:
+                    self._state_handle.close()
+                except Exception as e:
+                    logger.error(f"Failed to close state file '{self.state_file}': {e}")
+                self._state_handle = None
+    
     def is_processed(self, url: str) -> bool:
         """Check if a URL has been processed.
         
@@ -7,17 +7,103 @@ offering type safety, validation, and encapsulation of site-specific logic.
 """
 
 import os
+import sys
+import json
 import yaml
 import random
-from typing import Dict, List, Optional, Any, Union
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Union
 from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import urlparse
+from smutscrape.models import DATACLASS_OPTIONS
 from loguru import logger
 from rich.table import Table
 from rich.console import Group
 
+# Use libyaml's C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as YAMLLoader
 
-@dataclass
+# Parsed site configs are cached as JSON in this subdirectory of the site directory
+SITE_CACHE_DIR = '.cache'
+# Bump to invalidate every cached site config after changing how they are parsed
+SITE_CACHE_VERSION = 1
+# String values up to this length are interned along with every key
+INTERN_MAX_LENGTH = 64
+# Video scraper fields that are not reported as metadata
+METADATA_EXCLUDED_FIELDS = frozenset(('title', 'download_url', 'image'))
+# Identifiers remembered by SiteManager.get_site_by_identifier
+SITE_LOOKUP_CACHE_SIZE = 1024
+# Threads used to read and parse site files in parallel
+SITE_LOAD_WORKERS = min(8, os.cpu_count() or 4)
+
+
+def normalize_netloc(netloc: str) -> str:
+    """Lowercase a network location and drop a leading 'www.'"""
+    netloc = netloc.lower()
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+
+def _intern_tree(obj: Any) -> Any:
+    """Return a copy of a parsed config with keys and short strings interned"""
+    if isinstance(obj, dict):
+        return {
+            (sys.intern(k) if isinstance(k, str) else k): _intern_tree(v)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_intern_tree(v) for v in obj]
+    if isinstance(obj, str) and len(obj) <= INTERN_MAX_LENGTH:
+        return sys.intern(obj)
+    return obj
+
+
+def read_site_config(config_path: str, st: Optional[os.stat_result] = None) -> Any:
+    """Parse a site YAML file, reusing the cached JSON copy while the file is unchanged"""
+    if st is None:
+        st = os.stat(config_path)
+    stamp = [SITE_CACHE_VERSION, st.st_mtime_ns, st.st_size]
+    site_directory, config_file = os.path.split(config_path)
+    cache_path = os.path.join(site_directory, SITE_CACHE_DIR, f"{config_file}.json")
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('stamp') == stamp:
+            return _intern_tree(cached['config'])
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    
+    with open(config_path, 'rb') as f:
+        config_dict = yaml.load(f.read(), Loader=YAMLLoader)
+    _write_site_cache(cache_path, stamp, config_dict)
+    return _intern_tree(config_dict)
+
+
+def _write_site_cache(cache_path: str, stamp: List[int], config_dict: Any):
+    """Atomically store a parsed site config, skipping ones JSON can't represent exactly"""
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        encoded = json.dumps({'stamp': stamp, 'config': config_dict})
+        # Non-string keys and YAML-only types don't survive JSON; leave those uncached
+        if json.loads(encoded)['config'] != config_dict:
+            return
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(encoded)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Could not cache site config at '{cache_path}': {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+@dataclass(frozen=True, **DATACLASS_OPTIONS)
 class ModeConfig:
     """Configuration for a specific mode (e.g., 'channel', 'search', 'video')"""
     name: str
@@ -27,8 +113,15 @@ class ModeConfig:
     url_pattern_pages: Optional[str] = None
     scraper: Optional[str] = None
     max_pages: Optional[int] = None
-    url_encoding_rules: Dict[str, str] = field(default_factory=dict)
+    url_encoding_rules: Mapping[str, str] = field(default_factory=dict)
     video_id_placeholder: Optional[str] = None  # For video mode
+    has_special_encoding: bool = field(init=False, default=False)
+    
+    def __post_init__(self):
+        """Make encoding rules read-only and flag modes whose rules let terms be combined with '&'"""
+        rules = MappingProxyType(dict(self.url_encoding_rules or {}))
+        object.__setattr__(self, 'url_encoding_rules', rules)
+        object.__setattr__(self, 'has_special_encoding', any('&' in str(key) for key in rules))
     
     def supports_pagination(self) -> bool:
         """Check if this mode supports pagination"""
@@ -41,7 +134,7 @@ class ModeConfig:
         return self.url_pattern
 
 
-@dataclass 
+@dataclass(frozen=True, **DATACLASS_OPTIONS)
 class ScraperFieldConfig:
     """Configuration for a scraper field"""
     selector: Union[str, List[str]]
@@ -64,7 +157,7 @@ class ScraperFieldConfig:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ScraperConfig:
     """Configuration for a scraper (video, list, or rss)"""
     name: str
@@ -101,11 +194,13 @@ class ScraperConfig:
             return cls(name=name, fields=fields)
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_OPTIONS)
 class DownloadConfig:
     """Configuration for download settings"""
     method: str = "curl"
     impersonate: Union[bool, str] = False
+    parallel_connections: int = 4
+    segment_workers: int = 1
     
     @classmethod
     def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'DownloadConfig':
@@ -114,13 +209,56 @@ class DownloadConfig:
             return cls()
         return cls(
             method=data.get('method', 'curl'),
-            impersonate=data.get('impersonate', False)
+            impersonate=data.get('impersonate', False),
+            parallel_connections=data.get('parallel_connections', 4),
+            segment_workers=data.get('segment_workers', 1)
         )
 
 
+def _validate_sections(modes: Any, scrapers: Any):
+    """Check the shape SiteConfiguration.modes and .scrapers rely on, raising ValueError if it's wrong"""
+    if not isinstance(modes, Mapping):
+        raise ValueError("'modes' must be a mapping")
+    for mode_name, mode_data in modes.items():
+        if not isinstance(mode_data, Mapping):
+            raise ValueError(f"mode '{mode_name}' must be a mapping")
+    if not isinstance(scrapers, Mapping):
+        raise ValueError("'scrapers' must be a mapping")
+    for scraper_name, scraper_data in scrapers.items():
+        if not isinstance(scraper_data, Mapping):
+            raise ValueError(f"scraper '{scraper_name}' must be a mapping")
+        if scraper_name == 'list_scraper':
+            video_item = scraper_data.get('video_item')
+            if video_item is None:
+                continue
+            if not isinstance(video_item, Mapping):
+                raise ValueError("'list_scraper.video_item' must be a mapping")
+            fields = video_item.get('fields', {})
+        else:
+            fields = scraper_data
+        if not isinstance(fields, Mapping):
+            raise ValueError(f"fields of scraper '{scraper_name}' must be a mapping")
+        for field_name, field_config in fields.items():
+            if field_name in ('pagination', 'video_container', 'video_item') and scraper_name != 'list_scraper':
+                continue
+            if not isinstance(field_config, (str, Mapping)):
+                raise ValueError(f"field '{field_name}' of scraper '{scraper_name}' must be a selector string or mapping")
+
+
 class SiteConfiguration:
     """Encapsulates all configuration for a website"""
     
+    __slots__ = (
+        'config_file', '_raw_config', 'name', 'shortcode', 'domain', 'base_url',
+        'use_selenium', 'm3u8_mode', 'mp4_mode', 'detect_mode',
+        'name_prefix', 'name_suffix', 'unique_name', 'remove_title_string',
+        'note', 'url_encoding_rules', 'download', 'iframe',
+        '_shortcode_lc', '_name_lc', '_domain_lc', '_base_netloc',
+        '_modes_raw', '_scrapers_raw', '_modes', '_scrapers',
+        '_metadata_fields', '_mode_footnotes', '_mode_displays',
+        '_code_display', '_site_display',
+    )
+    
     def __init__(self, config_dict: Dict[str, Any], config_file: str = None):
         """Initialize from a configuration dictionary"""
         self.config_file = config_file
@@ -131,6 +269,11 @@ class SiteConfiguration:
         self.shortcode = config_dict.get('shortcode', '??')
         self.domain = config_dict.get('domain', 'n/a')
         self.base_url = config_dict.get('base_url', '')
+        # Normalized forms used for identifier and URL matching
+        self._shortcode_lc = self.shortcode.lower()
+        self._name_lc = self.name.lower()
+        self._domain_lc = self.domain.lower() if self.domain else ''
+        self._base_netloc = normalize_netloc(urlparse(self.base_url).netloc) if self.base_url else ''
         
         # Features
         self.use_selenium = config_dict.get('use_selenium', False)
@@ -150,25 +293,21 @@ class SiteConfiguration:
         # URL encoding rules
         self.url_encoding_rules = config_dict.get('url_encoding_rules', {})
         
-        # Parse modes
-        self.modes: Dict[str, ModeConfig] = {}
-        for mode_name, mode_data in config_dict.get('modes', {}).items():
-            self.modes[mode_name] = ModeConfig(
-                name=mode_name,
-                tip=mode_data.get('tip', 'No description available'),
-                examples=mode_data.get('examples', []),
-                url_pattern=mode_data.get('url_pattern', ''),
-                url_pattern_pages=mode_data.get('url_pattern_pages'),
-                scraper=mode_data.get('scraper'),
-                max_pages=mode_data.get('max_pages'),
-                url_encoding_rules=mode_data.get('url_encoding_rules', {}),
-                video_id_placeholder=mode_data.get('video_id_placeholder')
-            )
+        # Modes and scrapers are parsed on first access; their shape is checked now so a
+        # malformed site still fails to load instead of failing later on first use
+        self._modes_raw = config_dict.get('modes', {})
+        self._scrapers_raw = config_dict.get('scrapers', {})
+        _validate_sections(self._modes_raw, self._scrapers_raw)
+        self._modes: Optional[Dict[str, ModeConfig]] = None
+        self._scrapers: Optional[Dict[str, ScraperConfig]] = None
+        # Derived display data, computed once on first use
+        self._metadata_fields: Optional[List[str]] = None
+        self._mode_footnotes: Optional[Dict[str, str]] = None
+        self._mode_displays: Optional[Dict[str, str]] = None
         
-        # Parse scrapers
-        self.scrapers: Dict[str, ScraperConfig] = {}
-        for scraper_name, scraper_data in config_dict.get('scrapers', {}).items():
-            self.scrapers[scraper_name] = ScraperConfig.from_dict(scraper_name, scraper_data)
+        # Rich markup for the global sites table
+        self._code_display = f"[magenta][bold]{self.shortcode}[/bold][/magenta]"
+        self._site_display = f"[magenta]{self.name}[/magenta]" + (" †" if self.use_selenium else "")
         
         # Download configuration
         self.download = DownloadConfig.from_dict(config_dict.get('download'))
@@ -176,31 +315,62 @@ class SiteConfiguration:
         # Iframe configuration
         self.iframe = config_dict.get('iframe', {'enabled': False})
     
+    @property
+    def modes(self) -> Dict[str, ModeConfig]:
+        """Mode configurations, keyed by mode name"""
+        if self._modes is None:
+            try:
+                self._modes = {
+                    mode_name: ModeConfig(
+                        name=mode_name,
+                        tip=mode_data.get('tip', 'No description available'),
+                        examples=mode_data.get('examples', []),
+                        url_pattern=mode_data.get('url_pattern', ''),
+                        url_pattern_pages=mode_data.get('url_pattern_pages'),
+                        scraper=mode_data.get('scraper'),
+                        max_pages=mode_data.get('max_pages'),
+                        url_encoding_rules=mode_data.get('url_encoding_rules', {}),
+                        video_id_placeholder=mode_data.get('video_id_placeholder')
+                    )
+                    for mode_name, mode_data in self._modes_raw.items()
+                }
+            except Exception as e:
+                logger.error(f"Invalid modes in site config '{self.shortcode}': {e}")
+                self._modes = {}
+            self._modes_raw = None
+        return self._modes
+    
+    @property
+    def scrapers(self) -> Dict[str, ScraperConfig]:
+        """Scraper configurations, keyed by scraper name"""
+        if self._scrapers is None:
+            try:
+                self._scrapers = {
+                    scraper_name: ScraperConfig.from_dict(scraper_name, scraper_data)
+                    for scraper_name, scraper_data in self._scrapers_raw.items()
+                }
+            except Exception as e:
+                logger.error(f"Invalid scrapers in site config '{self.shortcode}': {e}")
+                self._scrapers = {}
+            self._scrapers_raw = None
+        return self._scrapers
+    
     def matches_url(self, url: str) -> bool:
         """Check if a URL belongs to this site"""
-        parsed_url = urlparse(url)
-        netloc = parsed_url.netloc.lower().replace('www.', '')
-        
-        # Check against domain
-        if self.domain and self.domain.lower() == netloc:
-            return True
-        
-        # Check against base_url
-        if self.base_url:
-            base_netloc = urlparse(self.base_url).netloc.lower().replace('www.', '')
-            if base_netloc == netloc:
-                return True
-        
-        return False
+        return self.matches_netloc(normalize_netloc(urlparse(url).netloc))
+    
+    def matches_netloc(self, netloc: str) -> bool:
+        """Check if an already normalized network location belongs to this site"""
+        if not netloc:
+            return False
+        return netloc == self._domain_lc or netloc == self._base_netloc
     
     def matches_identifier(self, identifier: str) -> bool:
         """Check if an identifier matches this site (shortcode, name, or domain)"""
         identifier_lower = identifier.lower()
-        return any([
-            identifier_lower == self.shortcode.lower(),
-            identifier_lower == self.name.lower(),
-            identifier_lower == self.domain.lower()
-        ])
+        return (identifier_lower == self._shortcode_lc or
+                identifier_lower == self._name_lc or
+                identifier_lower == self._domain_lc)
     
     def get_mode(self, mode_name: str) -> Optional[ModeConfig]:
         """Get a mode configuration by name"""
@@ -223,28 +393,43 @@ class SiteConfiguration:
     
     def has_metadata_selectors(self) -> bool:
         """Check if site has metadata selectors beyond basic fields"""
-        video_scraper = self.scrapers.get('video_scraper')
-        if not video_scraper:
-            return False
-        
-        excluded = {'title', 'download_url', 'image'}
-        metadata_fields = [
-            field for field in video_scraper.fields.keys() 
-            if field not in excluded
-        ]
-        return bool(metadata_fields)
+        return bool(self.get_metadata_fields())
     
     def get_metadata_fields(self) -> List[str]:
         """Get list of metadata fields"""
-        video_scraper = self.scrapers.get('video_scraper')
-        if not video_scraper:
-            return []
-        
-        excluded = {'title', 'download_url', 'image'}
-        return sorted([
-            field for field in video_scraper.fields.keys() 
-            if field not in excluded
-        ])
+        if self._metadata_fields is None:
+            video_scraper = self.scrapers.get('video_scraper')
+            self._metadata_fields = sorted(
+                field for field in video_scraper.fields.keys()
+                if field not in METADATA_EXCLUDED_FIELDS
+            ) if video_scraper else []
+        return self._metadata_fields
+    
+    def get_mode_footnotes(self) -> Dict[str, str]:
+        """Get footnote markers per mode: ✦ for pagination, ‡ for '&' encoding rules"""
+        if self._mode_footnotes is None:
+            self._mode_footnotes = {
+                mode_name: ("✦" if mode.supports_pagination() else "") +
+                           ("‡" if mode.has_special_encoding else "")
+                for mode_name, mode in self.modes.items()
+            }
+        return self._mode_footnotes
+    
+    def get_mode_plain_displays(self) -> List[str]:
+        """Get each mode name followed by its footnote markers, without Rich markup"""
+        return [
+            f"{mode_name} {markers}" if markers else mode_name
+            for mode_name, markers in self.get_mode_footnotes().items()
+        ]
+    
+    def get_mode_displays(self) -> Dict[str, str]:
+        """Get Rich markup per mode: the highlighted mode name followed by its footnote markers"""
+        if self._mode_displays is None:
+            self._mode_displays = {
+                mode_name: f"[yellow][bold]{mode_name}[/bold][/yellow]" + (f" {markers}" if markers else "")
+                for mode_name, markers in self.get_mode_footnotes().items()
+            }
+        return self._mode_displays
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert back to dictionary format"""
@@ -291,22 +476,16 @@ class SiteConfiguration:
             
             has_pagination_footnote = False
             has_encoding_footnote = False
+            mode_footnotes = self.get_mode_footnotes()
+            mode_displays = self.get_mode_displays()
             for mode in self.modes.values():
                 example = random.choice(mode.examples) if mode.examples else "N/A"
                 example_cmd = f"[magenta]scrape {self.shortcode} {mode.name} \"{example}\"[/magenta]"
                 
-                # Check for footnotes per mode
-                supports_pagination = mode.supports_pagination()
-                has_special_encoding = " & " in mode.url_encoding_rules or "&" in mode.url_encoding_rules
-                footnotes = []
-                if supports_pagination:
-                    footnotes.append("✦")
-                    has_pagination_footnote = True
-                if has_special_encoding:
-                    footnotes.append("‡")
-                    has_encoding_footnote = True
-                mode_display = f"[yellow][bold]{mode.name}[/bold][/yellow]" + (f" {''.join(footnotes)}" if footnotes else "")
-                mode_table.add_row(mode_display, mode.tip, example_cmd)
+                markers = mode_footnotes[mode.name]
+                has_pagination_footnote = has_pagination_footnote or "✦" in markers
+                has_encoding_footnote = has_encoding_footnote or "‡" in markers
+                mode_table.add_row(mode_displays[mode.name], mode.tip, example_cmd)
             
             # Add all applicable footnotes
             footnotes = []
@@ -335,44 +514,71 @@ class SiteManager:
         """Initialize with a directory containing site YAML files"""
         self.site_directory = site_directory
         self.sites: Dict[str, SiteConfiguration] = {}
+        # Lookup indexes built from self.sites; the first site in load order wins
+        self._by_netloc: Dict[str, SiteConfiguration] = {}
+        self._by_identifier: Dict[str, SiteConfiguration] = {}
+        self._selenium_sites: List[SiteConfiguration] = []
+        self._cached_lookup = lru_cache(maxsize=SITE_LOOKUP_CACHE_SIZE)(self._lookup_site)
         self._load_sites()
     
     def _load_sites(self):
         """Load all site configurations from the directory"""
         if not os.path.exists(self.site_directory):
             logger.error(f"Site directory '{self.site_directory}' does not exist")
+            self._build_indexes()
             return
         
-        for config_file in os.listdir(self.site_directory):
-            if config_file.endswith('.yaml'):
-                config_path = os.path.join(self.site_directory, config_file)
-                try:
-                    with open(config_path, 'r') as f:
-                        config_dict = yaml.safe_load(f)
-                    
-                    if config_dict:
-                        site = SiteConfiguration(config_dict, config_file)
-                        # Store by shortcode for quick lookup
-                        self.sites[site.shortcode] = site
-                        logger.debug(f"Loaded site config: {site.shortcode} ({site.name})")
-                except Exception as e:
-                    logger.warning(f"Failed to load site config '{config_file}': {e}")
+        with os.scandir(self.site_directory) as it:
+            entries = [entry for entry in it if entry.name.endswith('.yaml') and entry.is_file()]
+        
+        def parse(entry):
+            try:
+                return entry.name, entry.path, read_site_config(entry.path, entry.stat()), None
+            except Exception as e:
+                return entry.name, entry.path, None, e
+        
+        # Files are read and parsed concurrently, then registered in directory order
+        with ThreadPoolExecutor(max_workers=SITE_LOAD_WORKERS) as executor:
+            results = list(executor.map(parse, entries))
+        
+        for config_file, config_path, config_dict, error in results:
+            try:
+                if error is not None:
+                    raise error
+                if config_dict:
+                    site = SiteConfiguration(config_dict, config_file)
+                    # Store by shortcode for quick lookup
+                    self.sites[site.shortcode] = site
+                    logger.debug(f"Loaded site config: {site.shortcode} ({site.name})")
+            except Exception as e:
+                logger.warning(f"Failed to load site config '{config_file}': {e}")
+        
+        self._build_indexes()
+    
+    def _build_indexes(self):
+        """Index loaded sites by netloc and lowercased shortcode, name and domain, and collect Selenium sites"""
+        self._by_netloc = {}
+        self._by_identifier = {}
+        self._selenium_sites = [site for site in self.sites.values() if site.use_selenium]
+        for site in self.sites.values():
+            for netloc in (site._domain_lc, site._base_netloc):
+                if netloc:
+                    self._by_netloc.setdefault(netloc, site)
+            for key in (site._shortcode_lc, site._name_lc, site._domain_lc):
+                self._by_identifier.setdefault(key, site)
     
     def get_site_by_identifier(self, identifier: str) -> Optional[SiteConfiguration]:
         """Get site by URL, shortcode, name, or domain"""
+        return self._cached_lookup(identifier)
+    
+    def _lookup_site(self, identifier: str) -> Optional[SiteConfiguration]:
+        """Uncached lookup behind get_site_by_identifier"""
         # First check if it's a URL
         parsed = urlparse(identifier)
         if parsed.netloc:  # It's a URL
-            for site in self.sites.values():
-                if site.matches_url(identifier):
-                    return site
-        else:
-            # Check against shortcode, name, or domain
-            for site in self.sites.values():
-                if site.matches_identifier(identifier):
-                    return site
-        
-        return None
+            return self._by_netloc.get(normalize_netloc(parsed.netloc))
+        # Check against shortcode, name, or domain
+        return self._by_identifier.get(identifier.lower())
     
     def get_site_by_shortcode(self, shortcode: str) -> Optional[SiteConfiguration]:
         """Get site by shortcode"""
@@ -384,11 +590,12 @@ class SiteManager:
     
     def get_sites_requiring_selenium(self) -> List[SiteConfiguration]:
         """Get all sites that require Selenium"""
-        return [site for site in self.sites.values() if site.use_selenium]
+        return list(self._selenium_sites)
     
     def reload(self):
         """Reload all site configurations"""
         self.sites.clear()
+        self._cached_lookup.cache_clear()
         self._load_sites()
     
     def generate_global_table(self, term_width: int, output_path: Optional[str] = None):
@@ -404,8 +611,8 @@ class SiteManager:
         encoding_rule_sites = set()
         pagination_modes = set()
         
-        # Use loaded sites instead of manually loading YAML files
-        for site in self.sites.values():
+        # Use loaded sites instead of manually loading YAML files, sorted once by shortcode
+        for site in sorted(self.sites.values(), key=lambda s: s.shortcode):
             try:
                 site_name = site.name
                 site_code = site.shortcode
@@ -414,31 +621,22 @@ class SiteManager:
                 if use_selenium:
                     selenium_sites.add(site_code)
                 
-                modes_display_list = []
-                for mode_name, mode_config in site.modes.items():
-                    supports_pagination = mode_config.supports_pagination()
-                    mode_url_rules = mode_config.url_encoding_rules
-                    has_special_encoding = " & " in str(mode_url_rules) or "&" in str(mode_url_rules)
-                    footnotes = []
-                    if supports_pagination:
-                        footnotes.append("✦")
+                for mode_name, markers in site.get_mode_footnotes().items():
+                    if "✦" in markers:
                         pagination_modes.add(mode_name)
-                    if has_special_encoding:
-                        footnotes.append("‡")
-                        if site_code not in encoding_rule_sites:
-                            encoding_rule_sites.add(site_code)
-                    mode_display = f"[yellow][bold]{mode_name}[/bold][/yellow]" + (f" {''.join(footnotes)}" if footnotes else "")
-                    modes_display_list.append(mode_display)
+                    if "‡" in markers:
+                        encoding_rule_sites.add(site_code)
+                modes_display_list = list(site.get_mode_displays().values())
                 
                 metadata = site.get_metadata_fields()
-                supported_sites.append((site_code, site_name, modes_display_list, metadata, use_selenium))
+                supported_sites.append((site_code, site_name, modes_display_list, metadata, use_selenium, site))
             except Exception as e:
                 logger.warning(f"Failed to process site '{site.shortcode}': {e}")
         
         if supported_sites:
-            for site_code, site_name, modes_display_list, metadata, use_selenium in sorted(supported_sites, key=lambda x: x[0]):
-                code_display = f"[magenta][bold]{site_code}[/bold][/magenta]"
-                site_display = f"[magenta]{site_name}[/magenta]" + (f" †" if use_selenium else "")
+            for site_code, site_name, modes_display_list, metadata, use_selenium, site in supported_sites:
+                code_display = site._code_display
+                site_display = site._site_display
                 modes_display = " · ".join(modes_display_list) if modes_display_list else "[gray]None[/gray]"
                 metadata_display = " · ".join(f"[green][bold]{field}[/bold][/green]" for field in metadata) if metadata else "None"
                 table.add_row(code_display, site_display, modes_display, metadata_display)
@@ -460,17 +658,16 @@ class SiteManager:
                 "| code   | site                          | modes                          | metadata                       |\n",
                 "| ------ | ----------------------------- | ------------------------------ | ------------------------------ |\n"
             ]
-            
-            for site_code, site_name, modes_display_list, metadata, use_selenium in sorted(supported_sites, key=lambda x: x[0]):
-                code_str = f"`{site_code}`"
-                site_str = f"**_{site_name}_**" + (f" †" if use_selenium else "")
-                # Strip Rich formatting and keep only mode name + footnotes
-                modes_str = " · ".join(
-                    mode.replace("[yellow][bold]", "").replace("[/bold][/yellow]", "") 
-                    for mode in modes_display_list
-                ) if modes_display_list else "None"
-                metadata_str = " · ".join(metadata) if metadata else "None"
-                md_lines.append(f"| {code_str:<6} | {site_str:<29} | {modes_str:<30} | {metadata_str:<30} |\n")
+            md_lines.extend(
+                "| {:<6} | {:<29} | {:<30} | {:<30} |\n".format(
+                    f"`{site_code}`",
+                    f"**_{site_name}_**" + (" †" if use_selenium else ""),
+                    # Mode names with footnotes, without Rich formatting
+                    " · ".join(site.get_mode_plain_displays()) or "None",
+                    " · ".join(metadata) if metadata else "None",
+                )
+                for site_code, site_name, modes_display_list, metadata, use_selenium, site in supported_sites
+            )
             
             if pagination_modes:
                 md_lines.append("\n✦ _Supports pagination; see optional arguments below._\n")
@@ -481,7 +678,7 @@ class SiteManager:
             
             try:
                 with open(output_path, 'w', encoding='utf-8') as f:
-                    f.writelines(md_lines)
+                    f.write(''.join(md_lines))
                 logger.info(f"Saved site table to '{output_path}' in Markdown format.")
             except Exception as e:
                 logger.error(f"Failed to write Markdown table to '{output_path}': {e}")
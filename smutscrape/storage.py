@@ -7,18 +7,160 @@ SMB uploads, local file management, permissions, and progress tracking.
 """
 
 import os
+import errno
 import pwd
 import grp
 import shutil
 import tempfile
-from typing import Dict, Any, Optional
+import atexit
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple
 from loguru import logger
 from tqdm import tqdm
-from smb.SMBConnection import SMBConnection
+from smutscrape.models import DATACLASS_OPTIONS
+
+if TYPE_CHECKING:
+    from smb.SMBConnection import SMBConnection
+
+# Machine name this client announces to SMB servers
+SMB_CLIENT_NAME = "videoscraper"
+# Direct-hosted SMB over TCP (no NetBIOS session layer), matching is_direct_tcp
+SMB_PORT = 445
+# Default number of SMB uploads that may run at once
+SMB_PARALLELISM = 4
+# Name prefix for files uploaded ahead of the upload they depend on, until they are renamed into place
+SMB_STAGING_PREFIX = ".part-"
+# Upload reads go through a buffer this large so pysmb is fed big contiguous chunks
+SMB_READ_BUFFER_SIZE = 4 * 1024 * 1024
+# Minimum size of the reusable buffers SMB upload chunks are read into
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+# Cap on the negotiated SMB2 write size, so each upload chunk fits a pooled buffer
+SMB_MAX_WRITE_SIZE = UPLOAD_BUFFER_SIZE
+# Bytes accumulated before the upload progress bar is updated
+PROGRESS_UPDATE_BYTES = 1024 * 1024
+# Minimum seconds between progress bar redraws during uploads
+PROGRESS_MININTERVAL = 0.5
+
+
+@dataclass(frozen=True, **DATACLASS_OPTIONS)
+class ResolvedPermissions:
+    """Numeric ownership and mode for a destination; -1 ids and a None mode are left unchanged."""
+    uid: int
+    gid: int
+    mode: Optional[int]
+
+
+@lru_cache(maxsize=128)
+def resolve_permissions(owner: Optional[str], uid: Any, group: Optional[str], gid: Any,
+                        mode: Optional[str]) -> ResolvedPermissions:
+    """Resolve a destination's permissions settings to numeric ids and mode once per distinct setting."""
+    return ResolvedPermissions(
+        uid=pwd.getpwnam(owner).pw_uid if owner and owner.isalpha() else int(-1 if uid is None else uid),
+        gid=grp.getgrnam(group).gr_gid if group and group.isalpha() else int(-1 if gid is None else gid),
+        mode=int(mode, 8) if mode is not None else None
+    )
+
+
+@lru_cache(maxsize=None)
+def _libc_fallocate():
+    """Return libc's fallocate(2), or None where it isn't available."""
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        fallocate = getattr(libc, 'fallocate64', None) or libc.fallocate
+    except (OSError, AttributeError):
+        return None
+    fallocate.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64)
+    fallocate.restype = ctypes.c_int
+    return fallocate
+
+
+def allocate_file(fd: int, size: int):
+    """
+    Reserve size bytes of real disk space for an open file so it is laid out in
+    as few extents as possible, falling back to a plain (sparse) resize.
+    
+    Uses fallocate(2) rather than posix_fallocate, which glibc emulates by writing
+    every block on filesystems without native support (NFS, CIFS).
+    """
+    fallocate = _libc_fallocate()
+    if fallocate is not None and size > 0:
+        if fallocate(fd, 0, 0, size) == 0:
+            return
+        import ctypes
+        logger.debug(f"fallocate unsupported here: {os.strerror(ctypes.get_errno())}")
+    os.ftruncate(fd, size)
+
+
+# Idle upload buffers shared by concurrent uploads
+_upload_buffers: "queue.SimpleQueue[bytearray]" = queue.SimpleQueue()
+
+
+def _copy_in_kernel(src_fd: int, dst_fd: int, size: int) -> bool:
+    """Copy size bytes between two fresh descriptors without user-space buffers; False if unsupported."""
+    if hasattr(os, 'copy_file_range'):
+        try:
+            offset = 0
+            while offset < size:
+                copied = os.copy_file_range(src_fd, dst_fd, min(size - offset, 1 << 30),
+                                            offset_src=offset, offset_dst=offset)
+                if not copied:
+                    break
+                offset += copied
+            return True
+        except OSError as e:
+            logger.debug(f"copy_file_range unavailable: {e}")
+    if hasattr(os, 'sendfile'):
+        # Explicit copy_file_range offsets leave the destination position at 0
+        try:
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, min(size - offset, 1 << 30))
+                if not sent:
+                    break
+                offset += sent
+            return True
+        except OSError as e:
+            logger.debug(f"sendfile unavailable: {e}")
+    return False
+
+
+def move_file(source_path: str, destination_path: str):
+    """
+    Move a file, renaming atomically when both paths share a filesystem.
+    
+    Across filesystems the data is copied in the kernel with copy_file_range
+    (reflinked on filesystems that support it), or sendfile where that is
+    unavailable, before removing the source.
+    """
+    try:
+        os.replace(source_path, destination_path)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    
+    with open(source_path, 'rb') as src, open(destination_path, 'wb') as dst:
+        size = os.fstat(src.fileno()).st_size
+        allocate_file(dst.fileno(), size)
+        copied = _copy_in_kernel(src.fileno(), dst.fileno(), size)
+    if not copied:
+        shutil.copyfile(source_path, destination_path)
+    shutil.copystat(source_path, destination_path)
+    os.unlink(source_path)
 
 
 class ProgressFile:
-    """A file-like wrapper to track progress during SMB upload."""
+    """A file-like wrapper to track progress during SMB upload.
+    
+    Chunks are read into a pooled buffer and returned as memoryview slices; pysmb
+    copies each chunk into its encoded write request before asking for the next.
+    """
     
     def __init__(self, file_obj, progress_bar):
         """Initialize progress file wrapper.
@@ -30,14 +172,47 @@ class ProgressFile:
         self.file_obj = file_obj
         self.pbar = progress_bar
         self.total_size = os.fstat(file_obj.fileno()).st_size
+        self._pending = 0
+        self._buffer = None
+        self._view = None
     
     def read(self, size=-1):
-        """Read data and update progress bar."""
-        data = self.file_obj.read(size)
+        """Read data and update progress bar once at least PROGRESS_UPDATE_BYTES have been read."""
+        if size is None or size < 0:
+            data = self.file_obj.read()
+        else:
+            if self._buffer is None or len(self._buffer) < size:
+                self._take_buffer(size)
+            data = self._view[:self.file_obj.readinto(self._view[:size])]
         if data:
-            self.pbar.update(len(data))
+            self._pending += len(data)
+            if self._pending >= PROGRESS_UPDATE_BYTES:
+                self.pbar.update(self._pending)
+                self._pending = 0
+        else:
+            self.finish()
         return data
     
+    def finish(self):
+        """Report any progress not yet passed to the progress bar and return the buffer to the pool."""
+        if self._pending:
+            self.pbar.update(self._pending)
+            self._pending = 0
+        if self._buffer is not None:
+            _upload_buffers.put(self._buffer)
+            self._buffer = self._view = None
+    
+    def _take_buffer(self, size: int):
+        """Reuse a pooled buffer of at least size bytes, allocating one if none is idle."""
+        try:
+            buffer = _upload_buffers.get_nowait()
+        except queue.Empty:
+            buffer = None
+        if buffer is None or len(buffer) < size:
+            buffer = bytearray(max(size, UPLOAD_BUFFER_SIZE))
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+    
     def __getattr__(self, name):
         """Delegate attribute access to wrapped file object."""
         return getattr(self.file_obj, name)
@@ -46,9 +221,94 @@ class ProgressFile:
 class StorageManager:
     """Manages all file storage operations including SMB and local storage."""
     
-    def __init__(self):
-        """Initialize the storage manager."""
-        pass
+    def __init__(self, smb_parallelism: int = SMB_PARALLELISM):
+        """Initialize the storage manager.
+        
+        Args:
+            smb_parallelism: Maximum number of SMB uploads (such as NFOs) running alongside
+                the callers' own uploads
+        """
+        # Workers for uploads overlapped with the caller's, each borrowing its own pooled connection
+        self._upload_executor = ThreadPoolExecutor(max_workers=smb_parallelism, thread_name_prefix="smb-upload")
+        # Idle SMB connections keyed by (server, share, username)
+        self._smb_pool: Dict[Tuple[str, str, str], List['SMBConnection']] = {}
+        self._smb_pool_lock = threading.Lock()
+        atexit.register(self.close_smb_connections)
+    
+    @contextmanager
+    def _smb_connection(self, destination_config: Dict[str, Any]):
+        """Borrow a connected SMBConnection from the pool, opening one if none is idle.
+        
+        The connection is returned to the pool when the block exits normally and
+        closed if the block raises.
+        """
+        key = (destination_config['server'], destination_config['share'], destination_config['username'])
+        conn = None
+        while conn is None:
+            with self._smb_pool_lock:
+                idle = self._smb_pool.get(key)
+                candidate = idle.pop() if idle else None
+            if candidate is None:
+                # pysmb is only imported once an SMB destination is actually used
+                from smb.SMBConnection import SMBConnection
+                conn = SMBConnection(
+                    destination_config['username'], 
+                    destination_config['password'], 
+                    SMB_CLIENT_NAME, 
+                    destination_config['server'],
+                    is_direct_tcp=True
+                )
+                if not conn.connect(destination_config['server'], SMB_PORT):
+                    raise ConnectionError(f"Failed to connect to SMB server {destination_config['server']}")
+                # SMB2 writes use the server's MaxWriteSize; SMB1 sessions leave it at 0
+                if conn.max_write_size:
+                    conn.max_write_size = min(conn.max_write_size, SMB_MAX_WRITE_SIZE)
+                logger.debug(f"Opened SMB connection to {destination_config['server']}")
+                break
+            try:
+                candidate.echo(b'ping')
+                conn = candidate
+            except Exception as e:
+                logger.debug(f"Discarding stale SMB connection: {e}")
+                self._close_smb(candidate)
+        
+        try:
+            yield conn
+        except BaseException:
+            self._close_smb(conn)
+            raise
+        with self._smb_pool_lock:
+            self._smb_pool.setdefault(key, []).append(conn)
+    
+    @staticmethod
+    def _close_smb(conn: 'SMBConnection'):
+        """Close an SMB connection, ignoring errors."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+    
+    def close_smb_connections(self):
+        """Close every idle pooled SMB connection."""
+        with self._smb_pool_lock:
+            pooled = [conn for conns in self._smb_pool.values() for conn in conns]
+            self._smb_pool.clear()
+        for conn in pooled:
+            self._close_smb(conn)
+    
+    @staticmethod
+    def _smb_path_exists(conn: 'SMBConnection', share: str, path: str) -> bool:
+        """Check for a remote path over an open connection.
+        
+        Only OperationFailure (e.g. STATUS_OBJECT_NAME_NOT_FOUND) means the path is
+        absent; transport errors propagate so the connection is not pooled again.
+        """
+        from smb.smb_structs import OperationFailure
+        try:
+            conn.getAttributes(share, path)
+            return True
+        except OperationFailure:
+            return False
     
     def apply_permissions(self, file_path: str, destination_config: Dict[str, Any]) -> bool:
         """Apply file permissions based on destination configuration.
@@ -65,29 +325,21 @@ class StorageManager:
             
         permissions = destination_config['permissions']
         try:
-            # Handle owner/uid
-            if 'owner' in permissions and permissions['owner'].isalpha():
-                uid = pwd.getpwnam(permissions['owner']).pw_uid
-            else:
-                uid = int(permissions.get('uid', -1))
-            
-            # Handle group/gid
-            if 'group' in permissions and permissions['group'].isalpha():
-                gid = grp.getgrnam(permissions['group']).gr_gid
-            else:
-                gid = int(permissions.get('gid', -1))
+            resolved = resolve_permissions(
+                permissions.get('owner'), permissions.get('uid'),
+                permissions.get('group'), permissions.get('gid'),
+                permissions.get('mode')
+            )
             
-            # Apply ownership if specified
-            if uid != -1 or gid != -1:
-                current_uid = os.stat(file_path).st_uid if uid == -1 else uid
-                current_gid = os.stat(file_path).st_gid if gid == -1 else gid
-                os.chown(file_path, current_uid, current_gid)
-                logger.debug(f"Applied ownership {current_uid}:{current_gid} to {file_path}")
+            # Apply ownership if specified; chown leaves an id of -1 unchanged
+            if resolved.uid != -1 or resolved.gid != -1:
+                os.chown(file_path, resolved.uid, resolved.gid)
+                logger.debug(f"Applied ownership {resolved.uid}:{resolved.gid} to {file_path}")
             
             # Apply file mode if specified
-            if 'mode' in permissions:
-                os.chmod(file_path, int(permissions['mode'], 8))
-                logger.debug(f"Applied mode {permissions['mode']} to {file_path}")
+            if resolved.mode is not None:
+                os.chmod(file_path, resolved.mode)
+                logger.debug(f"Applied mode {resolved.mode:o} to {file_path}")
             
             return True
             
@@ -105,32 +357,13 @@ class StorageManager:
         Returns:
             True if file exists, False otherwise
         """
-        conn = SMBConnection(
-            destination_config['username'], 
-            destination_config['password'], 
-            "videoscraper", 
-            destination_config['server']
-        )
-        
         try:
-            if not conn.connect(destination_config['server'], 445):
-                raise ConnectionError(f"Failed to connect to SMB server {destination_config['server']}")
-            
-            logger.debug(f"Connected to SMB server, checking {path}")
-            try:
-                conn.getAttributes(destination_config['share'], path)
-                return True
-            except:
-                return False
-                
+            with self._smb_connection(destination_config) as conn:
+                logger.debug(f"Connected to SMB server, checking {path}")
+                return self._smb_path_exists(conn, destination_config['share'], path)
         except Exception as e:
             logger.debug(f"Error checking SMB file existence for {path}: {e}")
             return False
-        finally:
-            try:
-                conn.close()
-            except:
-                pass
     
     def upload_to_smb(self, local_path: str, smb_path: str, destination_config: Dict[str, Any], 
                       overwrite: bool = False) -> bool:
@@ -147,32 +380,21 @@ class StorageManager:
         """
         logger.debug(f"Connecting to SMB for {os.path.basename(local_path)} -> {smb_path}")
         
-        conn = SMBConnection(
-            destination_config['username'], 
-            destination_config['password'], 
-            "videoscraper", 
-            destination_config['server']
-        )
-        
-        connected = False
         try:
-            connected = conn.connect(destination_config['server'], 445)
-            if not connected:
-                logger.error(f"Failed to connect to SMB share for {smb_path}")
-                return False
-            
-            # Check if file exists and respect overwrite flag
-            if not overwrite and self.file_exists_on_smb(destination_config, smb_path):
-                logger.info(f"File '{os.path.basename(smb_path)}' exists on SMB share '{destination_config['share']}' at '{smb_path}'. Skipping upload.")
-                return True
-            
-            # Upload with progress tracking
-            file_size = os.path.getsize(local_path)
-            with open(local_path, 'rb') as file:
-                with tqdm(total=file_size, unit='B', unit_scale=True, 
-                         desc=f"Uploading {os.path.basename(local_path)} to SMB") as pbar:
-                    progress_file = ProgressFile(file, pbar)
-                    conn.storeFile(destination_config['share'], smb_path, progress_file)
+            with self._smb_connection(destination_config) as conn:
+                # Probe only when overwrite is off; the absent path falls straight through to storeFile
+                if not overwrite and self._smb_path_exists(conn, destination_config['share'], smb_path):
+                    logger.info(f"File '{os.path.basename(smb_path)}' exists on SMB share '{destination_config['share']}' at '{smb_path}'. Skipping upload.")
+                    return True
+                
+                # Upload with progress tracking
+                file_size = os.path.getsize(local_path)
+                with open(local_path, 'rb', buffering=SMB_READ_BUFFER_SIZE) as file:
+                    with tqdm(total=file_size, unit='B', unit_scale=True, mininterval=PROGRESS_MININTERVAL,
+                             desc=f"Uploading {os.path.basename(local_path)} to SMB") as pbar:
+                        progress_file = ProgressFile(file, pbar)
+                        conn.storeFile(destination_config['share'], smb_path, progress_file)
+                        progress_file.finish()
             
             logger.debug(f"Successfully stored file on SMB: {smb_path}")
             return True
@@ -180,13 +402,6 @@ class StorageManager:
         except Exception as e:
             logger.error(f"Error during SMB operation for {os.path.basename(local_path)} to {smb_path}: {e}")
             return False
-        finally:
-            if connected and hasattr(conn, 'sock') and conn.sock:
-                try:
-                    conn.close()
-                    logger.debug(f"SMB connection closed for {smb_path}")
-                except:
-                    pass
     
     def manage_file(self, destination_path: str, destination_config: Dict[str, Any], 
                     overwrite: bool = False, video_url: Optional[str] = None, 
@@ -211,43 +426,83 @@ class StorageManager:
     def _manage_smb_file(self, destination_path: str, destination_config: Dict[str, Any], 
                         overwrite: bool = False) -> bool:
         """Handle SMB file management."""
-        smb_path = os.path.join(destination_config['path'], os.path.basename(destination_path))
-        smb_nfo_path = os.path.join(destination_config['path'], 
-                                   f"{os.path.basename(destination_path).rsplit('.', 1)[0]}.nfo")
+        base_name = os.path.basename(destination_path)
+        nfo_name = f"{base_name.rsplit('.', 1)[0]}.nfo"
+        smb_path = os.path.join(destination_config['path'], base_name)
+        smb_nfo_path = os.path.join(destination_config['path'], nfo_name)
+        temp_nfo_path = os.path.join(os.path.dirname(destination_path), nfo_name)
+        staged_nfo_path = os.path.join(destination_config['path'], f"{SMB_STAGING_PREFIX}{nfo_name}")
+        
+        # The NFO uploads under a hidden name while the video is in flight, and is only renamed
+        # into place once the video is on the share, so a failed video never leaves an orphan NFO.
+        nfo_future = None
+        if os.path.exists(temp_nfo_path):
+            nfo_future = self._upload_executor.submit(
+                self.upload_to_smb, temp_nfo_path, staged_nfo_path, destination_config, True
+            )
+        else:
+            logger.debug(f"No NFO file found at {temp_nfo_path} to upload.")
         
-        # Upload main video file
         smb_upload_successful = self.upload_to_smb(destination_path, smb_path, destination_config, overwrite)
+        nfo_staged = nfo_future.result() if nfo_future else False
         
         if smb_upload_successful:
             logger.success(f"Successfully processed video for SMB: {smb_path}")
             os.remove(destination_path)
             logger.debug(f"Removed temporary video file: {destination_path}")
             
-            # Handle NFO file upload if it exists
-            temp_nfo_path = f"{destination_path.rsplit('.', 1)[0]}.nfo"
-            if os.path.exists(temp_nfo_path):
-                nfo_upload_successful = self.upload_to_smb(temp_nfo_path, smb_nfo_path, 
-                                                          destination_config, overwrite)
-                if nfo_upload_successful:
+            if nfo_future:
+                if nfo_staged and self._commit_smb_file(destination_config, staged_nfo_path, smb_nfo_path, overwrite):
                     os.remove(temp_nfo_path)
                     logger.debug(f"Removed temporary NFO file: {temp_nfo_path}")
                 else:
-                    logger.error(f"Failed to upload NFO file {os.path.basename(temp_nfo_path)} to SMB. It remains at {temp_nfo_path}")
-            else:
-                logger.debug(f"No NFO file found at {temp_nfo_path} to upload.")
+                    logger.error(f"Failed to upload NFO file {nfo_name} to SMB. It remains at {temp_nfo_path}")
         else:
-            logger.error(f"Failed to upload video {os.path.basename(destination_path)} to SMB. It remains at {destination_path}")
-            # Check for NFO file that wasn't uploaded due to video failure
-            temp_nfo_path_on_failure = f"{destination_path.rsplit('.', 1)[0]}.nfo"
-            if os.path.exists(temp_nfo_path_on_failure):
-                logger.warning(f"NFO file {os.path.basename(temp_nfo_path_on_failure)} was not uploaded due to video upload failure. It remains at {temp_nfo_path_on_failure}")
+            logger.error(f"Failed to upload video {base_name} to SMB. It remains at {destination_path}")
+            if nfo_future:
+                if nfo_staged:
+                    self._discard_smb_file(destination_config, staged_nfo_path)
+                logger.warning(f"NFO file {nfo_name} was not uploaded due to video upload failure. It remains at {temp_nfo_path}")
         
         return smb_upload_successful
     
+    def _commit_smb_file(self, destination_config: Dict[str, Any], staged_path: str, 
+                         smb_path: str, overwrite: bool = False) -> bool:
+        """Rename a staged upload to its final path on the share.
+        
+        An existing file at smb_path is replaced when overwrite is set and kept otherwise,
+        in which case the staged copy is deleted.
+        """
+        share = destination_config['share']
+        try:
+            with self._smb_connection(destination_config) as conn:
+                if self._smb_path_exists(conn, share, smb_path):
+                    if not overwrite:
+                        logger.info(f"File '{os.path.basename(smb_path)}' exists on SMB share '{share}' at '{smb_path}'. Skipping upload.")
+                        conn.deleteFiles(share, staged_path)
+                        return True
+                    conn.deleteFiles(share, smb_path)
+                conn.rename(share, staged_path, smb_path)
+            logger.debug(f"Successfully stored file on SMB: {smb_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error moving {staged_path} into place at {smb_path} on SMB: {e}")
+            return False
+    
+    def _discard_smb_file(self, destination_config: Dict[str, Any], smb_path: str):
+        """Delete a file from the share, logging rather than raising on failure."""
+        try:
+            with self._smb_connection(destination_config) as conn:
+                conn.deleteFiles(destination_config['share'], smb_path)
+        except Exception as e:
+            logger.warning(f"Could not remove {smb_path} from SMB share: {e}")
+    
     def _manage_local_file(self, destination_path: str, destination_config: Dict[str, Any], 
                           overwrite: bool = False) -> bool:
         """Handle local file management."""
-        final_path = os.path.join(destination_config['path'], os.path.basename(destination_path))
+        base_name = os.path.basename(destination_path)
+        nfo_name = f"{base_name.rsplit('.', 1)[0]}.nfo"
+        final_path = os.path.join(destination_config['path'], base_name)
         os.makedirs(os.path.dirname(final_path), exist_ok=True)
         
         if not overwrite and os.path.exists(final_path):
@@ -260,13 +515,13 @@ class StorageManager:
         
         try:
             # Move main video file
-            shutil.move(destination_path, final_path)
+            move_file(destination_path, final_path)
             self.apply_permissions(final_path, destination_config)
             logger.success(f"Moved to local destination: {final_path}")
             
             # Handle NFO file for local move
-            temp_nfo_path = f"{destination_path.rsplit('.', 1)[0]}.nfo"
-            final_nfo_path = f"{final_path.rsplit('.', 1)[0]}.nfo"
+            temp_nfo_path = os.path.join(os.path.dirname(destination_path), nfo_name)
+            final_nfo_path = os.path.join(destination_config['path'], nfo_name)
             
             if os.path.exists(temp_nfo_path):
                 if not overwrite and os.path.exists(final_nfo_path):
@@ -274,7 +529,7 @@ class StorageManager:
                     if temp_nfo_path != final_nfo_path and os.path.exists(temp_nfo_path):
                         os.remove(temp_nfo_path)
                 else:
-                    shutil.move(temp_nfo_path, final_nfo_path)
+                    move_file(temp_nfo_path, final_nfo_path)
                     self.apply_permissions(final_nfo_path, destination_config)
                     logger.debug(f"Moved NFO to {final_nfo_path}")
             
@@ -288,9 +543,14 @@ class StorageManager:
 # Global storage manager instance
 storage_manager = None
 
-def get_storage_manager():
-    """Get or create the storage manager instance."""
+def get_storage_manager(general_config: Optional[Dict[str, Any]] = None):
+    """Get or create the storage manager instance.
+    
+    Args:
+        general_config: Configuration read for smb_parallelism when the instance is created
+    """
     global storage_manager
     if storage_manager is None:
-        storage_manager = StorageManager()
+        smb_parallelism = (general_config or {}).get('smb_parallelism', SMB_PARALLELISM)
+        storage_manager = StorageManager(smb_parallelism)
     return storage_manager 
\ No newline at end of file
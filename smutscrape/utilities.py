@@ -8,22 +8,76 @@ color manipulation, and VPN management.
 
 import os
 import re
+import json
 import random
-import subprocess
 import time
-import string
+import base64
+import shlex
+from functools import lru_cache
 from urllib.parse import urlparse
-from typing import Tuple, Optional, Dict, Any, List
+from typing import Tuple, Optional, Dict, Any, List, Callable
 from loguru import logger
-from termcolor import colored
-from rich.console import Console
-from rich.table import Table
-from rich.style import Style
-from rich.text import Text
-import art
 
-# Initialize console for rich output
-console = Console()
+# Optional Aho-Corasick automaton for long ignored-term lists
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Distinct (text, overrides, mode) combinations remembered by custom_title_case_cached
+TITLE_CASE_CACHE_SIZE = 65536
+# Adjacent lower/upper letters, e.g. "McFly", mark text whose casing is deliberate
+MIXED_CASE_PATTERN = re.compile(r'[a-z][A-Z]|[A-Z][a-z]')
+# URL pattern tokens: a static run (stray "}" included), or a "{name}" wildcard where a
+# repeated "{" restarts the name; a wildcard left open at the end is dropped
+URL_PATTERN_TOKEN = re.compile(r'([^{]+)|(?:\{[^{}]*)*\{([^{}]*)(\})?')
+# parse_url_pattern tokens: a "{name}" placeholder (up to the first "}"), a static run,
+# or a "{" that is never closed
+URL_COMPONENT_TOKEN = re.compile(r'\{([^}]*)\}|([^{]+)|(\{)')
+# Distinct (text, font) banner renders remembered by render_art_lines
+ART_CACHE_SIZE = 512
+# Per-font glyph widths used to skip fonts that cannot fit, kept across runs
+FONT_WIDTH_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "smutscrape", "font_widths.json")
+# Glyphs measured per font; the narrowest one's width times the number of these
+# characters in a text bounds the font's rendered width from below
+FONT_WIDTH_GLYPHS = frozenset(chr(code) for code in range(0x21, 0x7f))
+# Number of random examples shown by display_global_examples
+GLOBAL_EXAMPLE_COUNT = 10
+# Distinct ignored-term lists whose compiled patterns are kept by should_ignore_video
+IGNORE_PATTERN_CACHE_SIZE = 32
+# Ignored-term spellings from which the Aho-Corasick automaton replaces the regex alternation
+AHOCORASICK_MIN_TERMS = 64
+# Up to this many spellings, a plain substring test rules out most values before the regex runs
+IGNORE_SUBSTRING_PREFILTER_TERMS = 8
+# Lowercased prefixes is_url accepts without parsing
+URL_FAST_PREFIXES = ('http://', 'https://', 'ftp://')
+# Characters that need a real shell; VPN commands containing them are still run through /bin/sh
+SHELL_METACHARACTERS = frozenset('|&;<>()$`*?[]{}~\n')
+# Distinct site URL patterns whose parsed and compiled forms are kept
+URL_PATTERN_CACHE_SIZE = 256
+# Environment variable that seeds banner gradients and example picks for reproducible output
+DISPLAY_SEED_ENV = "SMUTSCRAPE_DISPLAY_SEED"
+
+# Dedicated generator for cosmetic choices, kept apart from the one behind filename UIDs
+_display_rng = random.Random(os.environ.get(DISPLAY_SEED_ENV))
+
+# Loaded from FONT_WIDTH_CACHE_PATH on first use
+_font_glyph_widths: Optional[Dict[str, int]] = None
+
+
+@lru_cache(maxsize=None)
+def get_console():
+    """Return the shared rich Console, importing rich on first use."""
+    from rich.console import Console
+    return Console()
+
+
+def __getattr__(name: str):
+    """Create the module-level console lazily so importing utilities stays cheap."""
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_terminal_width() -> int:
@@ -112,6 +166,16 @@ def interpolate_color(start_rgb: Tuple[int, int, int], end_rgb: Tuple[int, int,
     return int(r), int(g), int(b)
 
 
+def gradient_colors(start_rgb: Tuple[int, int, int], end_rgb: Tuple[int, int, int], 
+                    steps: int) -> List[Tuple[int, int, int]]:
+    """Return every color of a linear gradient at once; matches interpolate_color at each step."""
+    if steps <= 1:
+        return [tuple(start_rgb)] * steps
+    (r0, g0, b0), (r1, g1, b1) = start_rgb, end_rgb
+    dr, dg, db, last = r1 - r0, g1 - g0, b1 - b0, steps - 1
+    return [(int(r0 + dr * i / last), int(g0 + dg * i / last), int(b0 + db * i / last)) for i in range(steps)]
+
+
 def generate_adaptive_gradient(num_lines: int) -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
     """Generate subtle red/purple/pink gradients with HSV fixes."""
     base_gradients = [
@@ -124,7 +188,7 @@ def generate_adaptive_gradient(num_lines: int) -> Tuple[Tuple[int, int, int], Tu
         ((139, 0, 55), (255, 105, 97))      
     ]
     
-    start_rgb, end_rgb = random.choice(base_gradients)
+    start_rgb, end_rgb = _display_rng.choice(base_gradients)
     start_h, start_s, start_v = rgb_to_hsv(*start_rgb)
     end_h, end_s, end_v = rgb_to_hsv(*end_rgb)
     
@@ -149,6 +213,96 @@ def generate_adaptive_gradient(num_lines: int) -> Tuple[Tuple[int, int, int], Tu
     return start_rgb, clamped_rgb
 
 
+@lru_cache(maxsize=ART_CACHE_SIZE)
+def render_art_lines(text: str, font: str) -> Tuple[str, ...]:
+    """Render text with an art font, returning its non-blank lines with trailing whitespace removed."""
+    import art
+    art_text = art.text2art(text, font=font).replace("\t", "    ")
+    return tuple(line.rstrip() for line in art_text.splitlines() if line.strip())
+
+
+def _narrowest_glyph_width(font: str) -> int:
+    """Measure the narrowest FONT_WIDTH_GLYPHS glyph in a font; 0 if any of them fails to render."""
+    import art
+    narrowest = None
+    for glyph in FONT_WIDTH_GLYPHS:
+        # Rendered directly so the glyphs don't crowd real banners out of render_art_lines' cache
+        lines = [line.rstrip() for line in art.text2art(glyph, font=font).replace("\t", "    ").splitlines()]
+        width = max(map(len, lines), default=0)
+        if narrowest is None or width < narrowest:
+            narrowest = width
+    return narrowest or 0
+
+
+def get_font_glyph_widths(fonts: List[str]) -> Dict[str, int]:
+    """Return the narrowest glyph width of each font, measuring and persisting any not yet cached."""
+    global _font_glyph_widths
+    import art
+    art_version = getattr(art, "__version__", None)
+    glyphs = "".join(sorted(FONT_WIDTH_GLYPHS))
+    if _font_glyph_widths is None:
+        try:
+            with open(FONT_WIDTH_CACHE_PATH, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            valid = cached.get("art") == art_version and cached.get("glyphs") == glyphs
+            _font_glyph_widths = dict(cached["widths"]) if valid else {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            _font_glyph_widths = {}
+    
+    missing = [font for font in dict.fromkeys(fonts) if font not in _font_glyph_widths]
+    if missing:
+        for font in missing:
+            try:
+                _font_glyph_widths[font] = _narrowest_glyph_width(font)
+            except Exception:
+                # A width of 0 never excludes the font; the real probe reports the failure
+                _font_glyph_widths[font] = 0
+        try:
+            os.makedirs(os.path.dirname(FONT_WIDTH_CACHE_PATH), exist_ok=True)
+            tmp_path = f"{FONT_WIDTH_CACHE_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"art": art_version, "glyphs": glyphs, "widths": _font_glyph_widths}, f)
+            os.replace(tmp_path, FONT_WIDTH_CACHE_PATH)
+        except OSError as e:
+            logger.debug(f"Could not save font width cache: {e}")
+    return _font_glyph_widths
+
+
+def probe_font_widths(text: str, fonts: List[str], max_width: Optional[int] = None) -> Dict[str, int]:
+    """Return the rendered width of text for each font that renders it, probing each distinct font once.
+    
+    With max_width, fonts whose minimum possible width exceeds it are not rendered, since
+    they cannot fit. If none of the other fonts fits either, the skipped ones are probed
+    too, so the caller can still pick the narrowest of all.
+    """
+    candidates = list(dict.fromkeys(fonts))
+    skipped = []
+    if max_width:
+        glyph_widths = get_font_glyph_widths(candidates)
+        glyph_count = sum(1 for char in text if char in FONT_WIDTH_GLYPHS)
+        fitting = [font for font in candidates if glyph_widths.get(font, 0) * glyph_count <= max_width]
+        if len(fitting) < len(candidates):
+            logger.debug(f"Skipping {len(candidates) - len(fitting)} fonts that cannot fit in {max_width}")
+            fitting_set = set(fitting)
+            skipped = [font for font in candidates if font not in fitting_set]
+            candidates = fitting
+    
+    font_widths = {}
+    for font in candidates:
+        try:
+            lines = render_art_lines(text, font)
+        except Exception as e:
+            logger.debug(f"Font '{font}' rendering failed: {e}, skipping.")
+            continue
+        if lines:
+            font_widths[font] = max(map(len, lines))
+    if skipped and not any(width <= max_width for width in font_widths.values()):
+        font_widths.update(probe_font_widths(text, skipped))
+        # Keep the caller's font order for tie-breaking
+        font_widths = {font: font_widths[font] for font in fonts if font in font_widths}
+    return font_widths
+
+
 def render_ascii(input_text: str, general_config: Dict[str, Any], term_width: int, font: Optional[str] = None) -> bool:
     """Render ASCII art for the given input text using the art library with a specified or random font and gradient.
 
@@ -171,9 +325,7 @@ def render_ascii(input_text: str, general_config: Dict[str, Any], term_width: in
     if font:
         try:
             # Test if the font is valid by rendering the text
-            art_text = art.text2art(input_text, font=font)
-            art_text = art_text.replace("\t", "    ")
-            lines = [line.rstrip() for line in art_text.splitlines() if line.strip()]
+            lines = render_art_lines(input_text, font)
             if lines:
                 max_line_width = max(len(line) for line in lines)
                 # logger.debug(f"Specified font '{font}': Unbounded width = {max_line_width}")
@@ -196,19 +348,7 @@ def render_ascii(input_text: str, general_config: Dict[str, Any], term_width: in
             fonts = ["standard"]
 
         # Sample all fonts to get their unbounded width
-        font_widths = {}
-        for font in fonts:
-            try:
-                art_text = art.text2art(input_text, font=font)
-                art_text = art_text.replace("\t", "    ")
-                lines = [line.rstrip() for line in art_text.splitlines() if line.strip()]
-                if lines:
-                    max_line_width = max(len(line) for line in lines)
-                    font_widths[font] = max_line_width
-                    # logger.debug(f"Font '{font}': Unbounded width = {max_line_width}")
-            except Exception as e:
-                logger.debug(f"Font '{font}' rendering failed: {e}, skipping.")
-                continue
+        font_widths = probe_font_widths(input_text, fonts, max_width)
 
         if not font_widths:
             # logger.warning("No valid fonts found. Using fallback.")
@@ -230,11 +370,9 @@ def render_ascii(input_text: str, general_config: Dict[str, Any], term_width: in
                 selected_font, art_width = sorted_fonts[0]
                 logger.debug(f"Selected largest qualifying font: '{selected_font}' with width {art_width}")
 
-    # Render final art with the selected font
+    # Render final art with the selected font (already cached if it was probed)
     try:
-        art_text = art.text2art(input_text, font=selected_font)
-        art_text = art_text.replace("\t", "    ")
-        lines = [line.rstrip() for line in art_text.splitlines() if line.strip()]
+        lines = render_art_lines(input_text, selected_font)
         # logger.debug(f"Raw lines before trimming: {[line for line in lines]}")
     except Exception as e:
         logger.error(f"Failed to render ASCII art with font '{selected_font}': {e}")
@@ -264,22 +402,26 @@ def render_ascii(input_text: str, general_config: Dict[str, Any], term_width: in
     # Apply adaptive gradient
     start_rgb, end_rgb = generate_adaptive_gradient(len(centered_lines))
     logger.debug(f"start_rgb: {start_rgb}, end_rgb: {end_rgb}")
-    steps = len(centered_lines)
-
-    for i, line in enumerate(centered_lines):
-        if steps > 1:
-            rgb = interpolate_color(start_rgb, end_rgb, steps, i)
-        else:
-            rgb = start_rgb
-        style = Style(color=f"rgb({rgb[0]},{rgb[1]},{rgb[2]})", bold=True)
-        text = Text(line, style=style)
-        console.print(text, justify="left", overflow="crop", no_wrap=True)
+    colors = gradient_colors(start_rgb, end_rgb, len(centered_lines))
+    from rich.style import Style
+    from rich.text import Text
+    console = get_console()
+
+    # Build the whole banner as one Text so it is rendered and written in a single print
+    banner = Text()
+    for i, (line, (r, g, b)) in enumerate(zip(centered_lines, colors)):
+        if i:
+            banner.append("\n")
+        banner.append(line, style=Style(color=f"rgb({r},{g},{b})", bold=True))
+    if banner:
+        console.print(banner, justify="left", overflow="crop", no_wrap=True)
 
     return True
 
 
 def display_options():
     """Display command-line options."""
+    console = get_console()
     console.print("[bold][yellow]optional arguments:[/yellow][/bold]")
     console.print("  [magenta]-o[/magenta], [magenta]--overwrite[/magenta]               replace files with same name at download destination")
     console.print("  [magenta]-n[/magenta], [magenta]--re_nfo[/magenta]                  replace metadata in existing .nfo files")
@@ -292,32 +434,41 @@ def display_options():
 
 def display_global_examples(site_dir: str):
     """Display random examples from all sites."""
-    import yaml
+    console = get_console()
+    from smutscrape.sites import read_site_config
     
     console.print("[yellow][bold]examples[/bold] (generated from ./sites/):[/yellow]")
     
-    # Collect all site/mode/example combos
-    all_examples = []
-    for site_config_file in os.listdir(site_dir):
-        if site_config_file.endswith(".yaml"):
-            try:
-                with open(os.path.join(site_dir, site_config_file), 'r') as f:
-                    site_config = yaml.safe_load(f)
-                site_name = site_config.get("name", "Unknown")
-                shortcode = site_config.get("shortcode", "??")
-                modes = site_config.get("modes", {})
-                for mode, config in modes.items():
-                    tip = config.get("tip", "No description available")
-                    examples = config.get("examples", ["N/A"])
-                    for example in examples:
-                        all_examples.append((site_name, shortcode, mode, tip, example))
-            except Exception as e:
-                logger.warning(f"Failed to load config '{site_config_file}': {e}")
-    
-    # Randomly select up to 10 examples
-    selected_examples = random.sample(all_examples, min(10, len(all_examples))) if all_examples else []
+    # Reservoir-sample site/mode/example combos so only GLOBAL_EXAMPLE_COUNT are kept
+    selected_examples = []
+    seen = 0
+    with os.scandir(site_dir) as entries:
+        site_entries = [entry for entry in entries if entry.name.endswith(".yaml") and entry.is_file()]
+    for entry in site_entries:
+        try:
+            site_config = read_site_config(entry.path, entry.stat())
+            site_name = site_config.get("name", "Unknown")
+            shortcode = site_config.get("shortcode", "??")
+            modes = site_config.get("modes", {})
+            for mode, config in modes.items():
+                tip = config.get("tip", "No description available")
+                examples = config.get("examples", ["N/A"])
+                for example in examples:
+                    if seen < GLOBAL_EXAMPLE_COUNT:
+                        selected_examples.append((site_name, shortcode, mode, tip, example))
+                    else:
+                        j = _display_rng.randrange(seen + 1)
+                        if j < GLOBAL_EXAMPLE_COUNT:
+                            selected_examples[j] = (site_name, shortcode, mode, tip, example)
+                    seen += 1
+        except Exception as e:
+            logger.warning(f"Failed to load config '{entry.name}': {e}")
+    
+    # The reservoir keeps early picks in file order; shuffle to match random.sample's ordering
+    _display_rng.shuffle(selected_examples)
     
     # Display in a borderless table
+    from rich.table import Table
     table = Table(show_edge=False, expand=True, show_lines=False, show_header=True)
     table.add_column("[magenta][bold]command[/bold][/magenta]", justify="right")
     table.add_column("[yellow]action[/yellow]", justify="left")
@@ -333,6 +484,7 @@ def display_global_examples(site_dir: str):
 
 def display_usage(term_width: int, global_table):
     """Display usage information with the sites table."""
+    console = get_console()
     console.print("usage: [red]scrape[/red] [magenta]{site}[/magenta] [yellow]{mode}[/yellow] [blue]{query}[/blue]")
     console.print("       [red]scrape[/red] [blue]{url}[/blue]")
     console.print()
@@ -350,34 +502,55 @@ def display_usage(term_width: int, global_table):
 
 def is_url(string: str) -> bool:
     """Check if a string is a URL by parsing it with urlparse."""
+    # Common schemes always parse with a scheme, so skip urlparse for them
+    if string[:8].lower().startswith(URL_FAST_PREFIXES):
+        return True
     parsed = urlparse(string)
     # A string is considered a URL if it has a netloc (domain) or a scheme
-    return bool(parsed.netloc) or bool(parsed.scheme)
+    return bool(parsed.netloc or parsed.scheme)
+
+
+@lru_cache(maxsize=32)
+def _invalid_char_table(invalid_chars: Tuple[str, ...]) -> Optional[Dict[int, None]]:
+    """Build a str.translate deletion table, or None if any entry is longer than one character."""
+    if any(len(char) != 1 for char in invalid_chars):
+        return None
+    return str.maketrans('', '', ''.join(invalid_chars))
 
 
 def process_title(title: str, invalid_chars: List[str]) -> str:
     """Process title by removing invalid characters."""
     logger.debug(f"Processing {title} for invalid chars...")
-    for char in invalid_chars:
-        title = title.replace(char, "")
+    table = _invalid_char_table(tuple(invalid_chars))
+    if table is not None:
+        title = title.translate(table)
+    else:
+        # Multi-character entries depend on replacement order, so apply them one at a time
+        for char in invalid_chars:
+            title = title.replace(char, "")
     logger.debug(f"Processed title: {title}")
     return title
 
 
+@lru_cache(maxsize=32)
+def _title_case_overrides(uppercase_list: Tuple[str, ...]) -> Dict[str, str]:
+    """Map each lowercased override to its exact form; callers must not mutate the result."""
+    return {term.lower(): term for term in uppercase_list}
+
+
 def custom_title_case(text: str, uppercase_list: Optional[List[str]] = None, 
                      preserve_mixed_case: bool = False) -> str:
     """Apply custom title casing with exact match overrides from uppercase_list."""
     if not text:
         return text
-    uppercase_list = uppercase_list or []
+    
+    # Case-insensitive mapping of overrides to their exact form
+    override_map = _title_case_overrides(tuple(uppercase_list or ()))
     
     # If preserving mixed case (e.g., "McFly") and not in uppercase_list, return as-is
-    if preserve_mixed_case and re.search(r'[a-z][A-Z]|[A-Z][a-z]', text) and text.lower() not in {u.lower() for u in uppercase_list}:
+    if preserve_mixed_case and MIXED_CASE_PATTERN.search(text) and text.lower() not in override_map:
         return text
     
-    # Build a case-insensitive mapping of overrides to their exact form
-    override_map = {term.lower(): term for term in uppercase_list}
-    
     # Split into words
     words = text.split()
     if not words:
@@ -385,19 +558,27 @@ def custom_title_case(text: str, uppercase_list: Optional[List[str]] = None,
         text_lower = text.lower()
         return override_map.get(text_lower, text.title())
     
-    # Process each word
+    # Process each word; overrides use their exact form (e.g., "BrutalX")
+    apply_title = not preserve_mixed_case or len(words) > 1
     result = []
     for word in words:
-        word_lower = word.lower()
-        if word_lower in override_map:
-            result.append(override_map[word_lower])  # Use exact form (e.g., "BrutalX")
+        override = override_map.get(word.lower())
+        if override is not None:
+            result.append(override)
         else:
-            result.append(word.title() if not preserve_mixed_case or len(words) > 1 else word)
+            result.append(word.title() if apply_title else word)
     
     final_text = ' '.join(result)
     return final_text
 
 
+@lru_cache(maxsize=TITLE_CASE_CACHE_SIZE)
+def custom_title_case_cached(text: str, uppercase_list: Tuple[str, ...] = (),
+                             preserve_mixed_case: bool = False) -> str:
+    """Memoized custom_title_case; uppercase_list must be a tuple so it can be hashed."""
+    return custom_title_case(text, uppercase_list, preserve_mixed_case)
+
+
 def construct_filename(title: str, site_config: Dict[str, Any], 
                       general_config: Dict[str, Any]) -> str:
     """Construct a filename from title and configuration parameters."""
@@ -414,8 +595,8 @@ def construct_filename(title: str, site_config: Dict[str, Any],
     # Process title by removing invalid characters
     processed_title = process_title(title, invalid_chars)
     
-    # Generate a unique ID if needed (6 random characters)
-    unique_id = '_' + ''.join(random.choices(string.ascii_lowercase + string.ascii_uppercase + string.digits, k=6)) if unique_name or make_unique else ''
+    # Generate a unique ID if needed (6 random lowercase base32 characters)
+    unique_id = '_' + base64.b32encode(os.urandom(5)).decode('ascii')[:6].lower() if unique_name or make_unique else ''
     
     # Calculate available length for the title, accounting for the unique ID if present
     fixed_length = len(prefix) + len(suffix) + len(extension) + len(unique_id)
@@ -430,55 +611,101 @@ def construct_filename(title: str, site_config: Dict[str, Any],
         processed_title = processed_title[:max_title_chars].rstrip()
         logger.debug(f"Truncated title to {max_title_chars} chars: {processed_title}")
     
-    # Construct final filename with unique ID before extension
-    if unique_id:
-        filename = f"{prefix}{processed_title}{suffix}{unique_id}{extension}"
-    else:
-        filename = f"{prefix}{processed_title}{suffix}{extension}"
+    # Trim the title on the byte side if needed (Linux limit is 255 bytes, not chars).
+    # UTF-8 uses at most 4 bytes per char, so short names can skip encoding entirely.
+    fixed_parts = ''.join((prefix, suffix, unique_id, extension))
+    if (len(processed_title) + len(fixed_parts)) * 4 > 255:
+        title_bytes = processed_title.encode('utf-8')
+        byte_budget = 255 - len(fixed_parts.encode('utf-8'))
+        if len(title_bytes) > byte_budget:
+            # Dropping a partial trailing sequence keeps the cut on a codepoint boundary
+            processed_title = title_bytes[:max(byte_budget, 0)].decode('utf-8', 'ignore').rstrip()
+            logger.debug(f"Filename exceeded 255 bytes; trimmed title to: {processed_title}")
     
-    # Double-check byte length (Linux limit is 255 bytes, not chars)
-    while len(filename.encode('utf-8')) > 255:
-        excess = len(filename.encode('utf-8')) - 255
-        trim_chars = excess // 4 + 1  # Rough estimate for UTF-8; adjust conservatively
-        processed_title = processed_title[:-trim_chars].rstrip()
-        
-        # Reconstruct the filename with the trimmed title
-        if unique_id:
-            filename = f"{prefix}{processed_title}{suffix}{unique_id}{extension}"
-        else:
-            filename = f"{prefix}{processed_title}{suffix}{extension}"
-            
-        logger.debug(f"Filename exceeded 255 bytes; trimmed to: {filename}")
+    # Construct final filename with unique ID before extension
+    filename = ''.join((prefix, processed_title, suffix, unique_id, extension))
 
     logger.debug(f"Generated filename: {filename}")
     return filename
 
 
+def _is_word_boundary(text: str, index: int) -> bool:
+    """Mirror re's \\b: exactly one side of index is a word character."""
+    before = index > 0 and (text[index - 1].isalnum() or text[index - 1] == '_')
+    after = index < len(text) and (text[index].isalnum() or text[index] == '_')
+    return before != after
+
+
+@lru_cache(maxsize=IGNORE_PATTERN_CACHE_SIZE)
+def _ignored_term_finder(ignored_terms: Tuple[str, ...]) -> Callable[[str], Optional[str]]:
+    """Build a matcher returning the ignored term found as a whole word in a text, or None.
+    
+    Each term also matches its hyphen-encoded form, case-insensitively. Long lists use an
+    Aho-Corasick automaton when pyahocorasick is installed, otherwise one regex alternation.
+    """
+    spellings = {}
+    for term in ignored_terms:
+        term_lower = term.lower()
+        spellings.setdefault(term_lower, term_lower)
+        spellings.setdefault(term_lower.replace(' ', '-'), term_lower)
+    
+    if AHOCORASICK_AVAILABLE and len(spellings) >= AHOCORASICK_MIN_TERMS and '' not in spellings:
+        automaton = ahocorasick.Automaton()
+        for spelling, term in spellings.items():
+            automaton.add_word(spelling, (len(spelling), term))
+        automaton.make_automaton()
+        
+        def find(text: str) -> Optional[str]:
+            text_lower = text.lower()
+            for end, (length, term) in automaton.iter(text_lower):
+                if _is_word_boundary(text_lower, end - length + 1) and _is_word_boundary(text_lower, end + 1):
+                    return term
+            return None
+        return find
+    
+    search = re.compile(r'\b(?:' + '|'.join(map(re.escape, spellings)) + r')\b', re.IGNORECASE).search
+    plain_spellings = tuple(spellings) if len(spellings) <= IGNORE_SUBSTRING_PREFILTER_TERMS else None
+    
+    def find(text: str) -> Optional[str]:
+        # A whole-word match needs the spelling as a substring, which str's C search rules out cheaply
+        if plain_spellings is not None:
+            text_lower = text.lower()
+            if not any(spelling in text_lower for spelling in plain_spellings):
+                return None
+        match = search(text)
+        return spellings.get(match.group(0).lower(), match.group(0)) if match else None
+    return find
+
+
 def should_ignore_video(data: Dict[str, Any], ignored_terms: List[str]) -> bool:
     """Check if video should be ignored based on metadata and ignored terms."""
     if not ignored_terms:
         return False
-    ignored_terms_lower = [term.lower() for term in ignored_terms]
-    ignored_terms_encoded = [term.lower().replace(' ', '-') for term in ignored_terms]
+    find = _ignored_term_finder(tuple(ignored_terms))
     
-    # Compile regex patterns with word boundaries for efficiency
-    term_patterns = [re.compile(r'\b' + re.escape(term) + r'\b') for term in ignored_terms_lower]
-    encoded_patterns = [re.compile(r'\b' + re.escape(encoded) + r'\b') for encoded in ignored_terms_encoded]
+    # One search over every string value, NUL-separated so matches can't span fields
+    values = []
+    for value in data.values():
+        if isinstance(value, str):
+            values.append(value)
+        elif isinstance(value, list):
+            values.extend(value)
+    if find('\x00'.join(values)) is None:
+        return False
     
+    # Something matched; find the field to report
     for field, value in data.items():
         if isinstance(value, str):
-            value_lower = value.lower()
-            for term, term_pattern, encoded_pattern in zip(ignored_terms_lower, term_patterns, encoded_patterns):
-                if term_pattern.search(value_lower) or encoded_pattern.search(value_lower):
-                    logger.warning(f"Ignoring video due to term '{term}' in {field}: '{value}'")
-                    return True
+            term = find(value)
+            if term is not None:
+                logger.warning(f"Ignoring video due to term '{term}' in {field}: '{value}'")
+                return True
         elif isinstance(value, list):
             for item in value:
-                item_lower = item.lower()
-                for term, term_pattern, encoded_pattern in zip(ignored_terms_lower, term_patterns, encoded_patterns):
-                    if term_pattern.search(item_lower) or encoded_pattern.search(item_lower):
-                        logger.warning(f"Ignoring video due to term '{term}' in {field}: '{item}'")
-                        return True
+                term = find(item)
+                if term is not None:
+                    logger.warning(f"Ignoring video due to term '{term}' in {field}: '{item}'")
+                    return True
     return False
 
 
@@ -488,71 +715,46 @@ def should_ignore_video(data: Dict[str, Any], ignored_terms: List[str]) -> bool:
 
 def parse_url_pattern(pattern: str) -> List[Dict[str, Any]]:
     """Parse URL pattern into components."""
+    return [dict(component) for component in _parse_url_pattern(pattern)]
+
+
+@lru_cache(maxsize=URL_PATTERN_CACHE_SIZE)
+def _parse_url_pattern(pattern: str) -> Tuple[Dict[str, Any], ...]:
+    """Parse a URL pattern once; parse_url_pattern hands out copies of the cached components."""
     components = []
-    current_segment = ""
-    
-    i = 0
-    while i < len(pattern):
-        if pattern[i] == "{":
-            if current_segment:
-                components.append({"type": "static", "value": current_segment})
-                current_segment = ""
-            j = i + 1
-            while j < len(pattern) and pattern[j] != "}":
-                j += 1
-            if j < len(pattern):
-                placeholder = pattern[i+1:j]
-                components.append({"type": "wildcard", "name": placeholder, "numeric": placeholder == "page"})
-                i = j + 1
-            else:
-                raise ValueError(f"Unclosed placeholder in pattern: {pattern}")
+    for token in URL_COMPONENT_TOKEN.finditer(pattern):
+        placeholder, static, unclosed = token.groups()
+        if unclosed:
+            raise ValueError(f"Unclosed placeholder in pattern: {pattern}")
+        if placeholder is not None:
+            components.append({"type": "wildcard", "name": placeholder, "numeric": placeholder == "page"})
         else:
-            current_segment += pattern[i]
-            i += 1
-    
-    if current_segment:
-        components.append({"type": "static", "value": current_segment})
+            components.append({"type": "static", "value": static})
     
     logger.debug(f"Parsed pattern '{pattern}' into components: {components}")
-    return components
+    return tuple(components)
 
 
+@lru_cache(maxsize=URL_PATTERN_CACHE_SIZE)
 def pattern_to_regex(pattern: str) -> Tuple[re.Pattern, int, int]:
     """Convert URL pattern to regex with static count and length."""
-    regex = ""
+    parts = []
     static_count = 0
     static_length = 0
-    in_wildcard = False
-    current_static = ""
     numeric_wildcards = {"page"}
     
-    for char in pattern.rstrip("/"):
-        if char == "{":
-            if current_static:
-                regex += re.escape(current_static)
-                static_count += 1
-                static_length += len(current_static)
-                current_static = ""
-            in_wildcard = True
-            wildcard_name = ""
-        elif char == "}":
-            if in_wildcard:
-                if wildcard_name in numeric_wildcards:
-                    regex += f"(?P<{wildcard_name}>\\d+)"
-                else:
-                    regex += f"(?P<{wildcard_name}>[^/?&#]+)"
-                in_wildcard = False
+    for token in URL_PATTERN_TOKEN.finditer(pattern.rstrip("/")):
+        static, wildcard_name, closed = token.groups()
+        if static:
+            parts.append(re.escape(static))
+            static_count += 1
+            static_length += len(static)
+        elif closed:
+            if wildcard_name in numeric_wildcards:
+                parts.append(f"(?P<{wildcard_name}>\\d+)")
             else:
-                current_static += char
-        elif in_wildcard:
-            wildcard_name += char
-        else:
-            current_static += char
-    
-    if current_static:
-        regex += re.escape(current_static)
-        static_count += 1
-        static_length += len(current_static)
+                parts.append(f"(?P<{wildcard_name}>[^/?&#]+)")
+    regex = "".join(parts)
     
     if "?" not in pattern and "&" not in pattern:
         regex = f"^{regex}$"
@@ -561,13 +763,23 @@ def pattern_to_regex(pattern: str) -> Tuple[re.Pattern, int, int]:
     
     return re.compile(regex, re.IGNORECASE), static_count, static_length
 
-
 #
 
 # ============================================================================
 # VPN Management
 # ============================================================================
 
+@lru_cache(maxsize=16)
+def _vpn_argv(cmd: str) -> Optional[Tuple[str, ...]]:
+    """Split a VPN command into argv, or None when it needs shell features (or is empty)."""
+    if SHELL_METACHARACTERS.intersection(cmd):
+        return None
+    try:
+        return tuple(shlex.split(cmd)) or None
+    except ValueError:
+        return None
+
+
 def handle_vpn(general_config: Dict[str, Any], action: str = 'start') -> Optional[float]:
     """Handle VPN operations (start, stop, new_node).
     
@@ -585,11 +797,16 @@ def handle_vpn(general_config: Dict[str, Any], action: str = 'start') -> Optiona
     vpn_bin = vpn_config.get('vpn_bin', '')
     cmd = vpn_config.get(f"{action}_cmd", '').format(vpn_bin=vpn_bin)
     
+    import subprocess
+    argv = _vpn_argv(cmd)
     try:
-        subprocess.run(cmd, shell=True, check=True)
+        if argv:
+            subprocess.run(argv, check=True)
+        else:
+            subprocess.run(cmd, shell=True, check=True)
         current_time = time.time()
         logger.info(f"VPN {action} executed")
         return current_time
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, OSError) as e:
         logger.error(f"Failed VPN {action}: {e}")
         return None 
\ No newline at end of file
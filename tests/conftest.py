@@ -0,0 +1,20 @@
+"""
+Shared pytest setup for the smutscrape unit tests.
+
+The tests exercise individual submodules, so the smutscrape package is registered
+without running its __init__, which pulls in the CLI and every optional component.
+"""
+
+import importlib.util
+import os
+import sys
+
+# Directory holding the smutscrape package sources
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "smutscrape")
+
+if "smutscrape" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "smutscrape", os.path.join(PACKAGE_DIR, "__init__.py"),
+        submodule_search_locations=[PACKAGE_DIR]
+    )
+    sys.modules["smutscrape"] = importlib.util.module_from_spec(spec)
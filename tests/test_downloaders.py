@@ -0,0 +1,84 @@
+"""Tests for M3U8 playlist handling and URL resolution hints in smutscrape.downloaders"""
+
+import urllib.parse
+
+import pytest
+
+from smutscrape.downloaders import (
+    MP4_QUALITY_HINT_PATTERN, playlist_segments, resolution_score, resolve_playlist_lines
+)
+
+
+def legacy_resolve(playlist_url, lines):
+    """The original resolution: urljoin every relative, non-tag line"""
+    base_url = playlist_url.rsplit('/', 1)[0] + "/"
+    return [
+        urllib.parse.urljoin(base_url, line) if line and not line.startswith(("#", "http")) else line
+        for line in lines
+    ]
+
+
+PLAYLIST_LINES = [
+    "#EXTM3U",
+    "#EXT-X-TARGETDURATION:10",
+    "#EXTINF:9.5,",
+    "seg-001.ts",
+    "#EXTINF:10.0,",
+    "/abs/seg-002.ts",
+    "#EXTINF:4,",
+    "../up/seg-003.ts",
+    "./here/seg-004.ts",
+    "//cdn.example.net/seg-005.ts",
+    "https://other.example.com/seg-006.ts",
+    "?token=abc",
+    "sub/dir/seg-007.ts?sig=1",
+    "",
+    "#EXT-X-ENDLIST",
+]
+
+
+@pytest.mark.parametrize("playlist_url", [
+    "https://example.com/hls/video/index.m3u8",
+    "https://example.com/hls/video/index.m3u8?token=xyz",
+    "https://example.com/index.m3u8#frag",
+    "http://example.com:8080/a/b/c/playlist.m3u8",
+])
+def test_resolve_playlist_lines_matches_urljoin(playlist_url):
+    assert resolve_playlist_lines(playlist_url, PLAYLIST_LINES) == legacy_resolve(playlist_url, PLAYLIST_LINES)
+
+
+def test_playlist_segments_pairs_extinf_durations():
+    segments, durations = playlist_segments(resolve_playlist_lines(
+        "https://example.com/hls/index.m3u8", PLAYLIST_LINES
+    ))
+    assert segments[0] == "https://example.com/hls/seg-001.ts"
+    assert len(segments) == len(durations) == 8
+    assert durations[:4] == [9.5, 10.0, 4.0, None]
+    assert all(duration is None for duration in durations[4:])
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://cdn.example.com/videos/1080p/clip.mp4", 1080),
+    ("https://cdn.example.com/clip_720p.mp4", 720),
+    ("https://cdn.example.com/clip-1080p60.mp4", 1080),
+    ("https://cdn.example.com/clip_1920x1080.mp4", 1080),
+    ("https://cdn.example.com/480P/clip_1280x720.mp4", 720),
+    ("https://cdn.example.com/a1080p3/clip.mp4", -1),
+    ("https://cdn.example.com/12345x7200/clip.mp4", -1),
+    ("https://cdn.example.com/id/98765432p/clip.mp4", -1),
+    ("https://cdn.example.com/clip.mp4", -1),
+])
+def test_resolution_score_requires_token_boundaries(url, expected):
+    assert resolution_score(url) == expected
+
+
+@pytest.mark.parametrize("url, is_video", [
+    ("https://cdn.example.com/clip_720p.mp4", True),
+    ("https://cdn.example.com/CLIP_1080P.mp4", True),
+    ("https://cdn.example.com/clip_640x360.mp4", True),
+    ("https://cdn.example.com/preview_900p.mp4", False),
+    ("https://cdn.example.com/x1080p/preview.mp4", False),
+    ("https://cdn.example.com/123456x78901.mp4", False),
+])
+def test_mp4_quality_hint_pattern(url, is_video):
+    assert bool(MP4_QUALITY_HINT_PATTERN.search(url)) is is_video
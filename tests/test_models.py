@@ -0,0 +1,115 @@
+"""Tests for the processed-URL index and processing state in smutscrape.models"""
+
+import pytest
+
+from smutscrape import models
+from smutscrape.models import ProcessedIndex, ProcessingState
+
+
+URLS = [
+    "https://example.com/video/1",
+    "https://example.com/video/2?page=3&sort=new",
+    "https://example.com/vidéo/ünïcode",
+    "http://example.org/a b",
+]
+
+
+def test_processed_index_membership():
+    index = ProcessedIndex(URLS[:2])
+    assert URLS[0] in index
+    assert URLS[1] in index
+    assert URLS[2] not in index
+    index.add(URLS[2])
+    index.add(URLS[2])
+    assert URLS[2] in index
+    assert len(index) == 3
+
+
+def test_processed_index_accepts_bytes():
+    index = ProcessedIndex([URLS[2]])
+    assert URLS[2].encode('utf-8') in index
+
+
+def test_processed_index_from_file_round_trip(tmp_path):
+    state_file = tmp_path / "state.txt"
+    state_file.write_text("".join(f"{url}\n" for url in URLS) + "\n  \n", encoding='utf-8')
+    index = ProcessedIndex.from_file(str(state_file))
+    assert len(index) == len(URLS)
+    assert all(url in index for url in URLS)
+    assert "https://example.com/video/3" not in index
+
+
+def test_processed_index_from_file_without_trailing_newline(tmp_path):
+    state_file = tmp_path / "state.txt"
+    state_file.write_text("\n".join(URLS), encoding='utf-8')
+    index = ProcessedIndex.from_file(str(state_file))
+    assert all(url in index for url in URLS)
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 16, 64])
+def test_processed_index_from_file_across_block_boundaries(tmp_path, monkeypatch, block_size):
+    # Small blocks split lines (and multi-byte characters) at every possible offset
+    monkeypatch.setattr(models, "STATE_READ_BLOCK_SIZE", block_size)
+    state_file = tmp_path / "state.txt"
+    state_file.write_text("".join(f"{url}\r\n" for url in URLS), encoding='utf-8')
+    index = ProcessedIndex.from_file(str(state_file))
+    assert len(index) == len(URLS)
+    assert all(url in index for url in URLS)
+
+
+def test_processed_index_from_file_at_default_block_size(tmp_path):
+    # Lines straddling the 1 MiB block boundary are joined before hashing
+    urls = [f"https://example.com/video/{i:07d}" for i in range(40000)]
+    assert sum(len(url) + 1 for url in urls) > 1 << 20
+    state_file = tmp_path / "state.txt"
+    state_file.write_text("".join(f"{url}\n" for url in urls), encoding='utf-8')
+    index = ProcessedIndex.from_file(str(state_file))
+    assert len(index) == len(urls)
+    assert all(url in index for url in urls)
+
+
+def test_processing_state_missing_file(tmp_path):
+    state = ProcessingState.from_file(str(tmp_path / "missing.txt"))
+    assert len(state.processed_urls) == 0
+
+
+def test_processing_state_flush_appends_only_new_urls(tmp_path):
+    state_file = tmp_path / "state.txt"
+    state_file.write_text(f"{URLS[0]}\n", encoding='utf-8')
+    state = ProcessingState.from_file(str(state_file))
+
+    state.mark_processed(URLS[0])
+    state.mark_processed(URLS[1])
+    state.mark_processed(URLS[1])
+    state.flush_to_file(str(state_file))
+    state.flush_to_file(str(state_file))
+
+    assert state_file.read_text(encoding='utf-8').splitlines() == URLS[:2]
+    assert state.is_processed(URLS[1])
+    reloaded = ProcessingState.from_file(str(state_file))
+    assert all(reloaded.is_processed(url) for url in URLS[:2])
+
+
+def test_processing_state_compact(tmp_path):
+    state_file = tmp_path / "state.txt"
+    state_file.write_text(f"{URLS[1]}\n{URLS[0]}\n{URLS[1]}\n\n", encoding='utf-8')
+    state = ProcessingState.from_file(str(state_file))
+    state.mark_processed(URLS[2])
+
+    state.compact(str(state_file))
+
+    assert state_file.read_text(encoding='utf-8') == "".join(f"{url}\n" for url in sorted(URLS[:3]))
+    assert not (tmp_path / "state.txt.tmp").exists()
+
+
+def test_processing_state_compacts_after_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(models, "STATE_COMPACT_INTERVAL", 3)
+    state_file = tmp_path / "state.txt"
+    state = ProcessingState()
+    for url in reversed(URLS):
+        state.mark_processed(url)
+        state.flush_to_file(str(state_file))
+
+    lines = state_file.read_text(encoding='utf-8').splitlines()
+    # The third flush compacted the file; the fourth appended after it
+    assert lines == sorted(list(reversed(URLS))[:3]) + [URLS[0]]
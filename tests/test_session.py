@@ -0,0 +1,46 @@
+"""Tests for the buffered state file in smutscrape.session"""
+
+import gc
+import threading
+import weakref
+
+from smutscrape.session import SessionManager
+
+
+def test_concurrent_saves_write_whole_lines(tmp_path):
+    state_file = tmp_path / "state.txt"
+    session = SessionManager(str(state_file))
+
+    def save(worker):
+        for i in range(200):
+            session.save_state(f"https://example.com/{worker}/{i}")
+
+    threads = [threading.Thread(target=save, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    session.close()
+
+    lines = state_file.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == len(set(lines)) == 1600
+    assert SessionManager(str(state_file)).is_processed("https://example.com/7/199")
+
+
+def test_flush_writes_buffered_entries(tmp_path):
+    state_file = tmp_path / "state.txt"
+    session = SessionManager(str(state_file))
+    session.save_state("https://example.com/1")
+    session.flush()
+    assert state_file.read_text(encoding='utf-8') == "https://example.com/1\n"
+    session.close()
+
+
+def test_closed_session_is_not_kept_alive(tmp_path):
+    session = SessionManager(str(tmp_path / "state.txt"))
+    session.save_state("https://example.com/1")
+    session.close()
+    ref = weakref.ref(session)
+    del session
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,137 @@
+"""Tests for local file finalization in smutscrape.storage"""
+
+import errno
+import os
+
+import pytest
+
+from smutscrape import storage
+from smutscrape.storage import move_file
+
+
+def test_move_file_same_filesystem(tmp_path):
+    source = tmp_path / "source.bin"
+    destination = tmp_path / "destination.bin"
+    source.write_bytes(b"data")
+    move_file(str(source), str(destination))
+    assert not source.exists()
+    assert destination.read_bytes() == b"data"
+
+
+@pytest.fixture
+def cross_device(monkeypatch):
+    """Make os.replace fail as it does across filesystems"""
+    def replace(src, dst):
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+    monkeypatch.setattr(storage.os, "replace", replace)
+
+
+@pytest.mark.parametrize("size", [0, 1, 3 * 1024 * 1024 + 17])
+def test_move_file_copies_across_filesystems(tmp_path, cross_device, size):
+    payload = os.urandom(size)
+    source = tmp_path / "source.bin"
+    destination = tmp_path / "destination.bin"
+    source.write_bytes(payload)
+    os.utime(source, (1000000000, 1000000000))
+
+    move_file(str(source), str(destination))
+
+    assert not source.exists()
+    assert destination.read_bytes() == payload
+    assert destination.stat().st_mtime == 1000000000
+
+
+def test_move_file_falls_back_to_userspace_copy(tmp_path, cross_device, monkeypatch):
+    monkeypatch.setattr(storage, "_copy_in_kernel", lambda src_fd, dst_fd, size: False)
+    source = tmp_path / "source.bin"
+    destination = tmp_path / "destination.bin"
+    source.write_bytes(b"x" * 4096)
+
+    move_file(str(source), str(destination))
+
+    assert not source.exists()
+    assert destination.read_bytes() == b"x" * 4096
+
+
+def test_copy_in_kernel(tmp_path):
+    payload = os.urandom(256 * 1024 + 5)
+    source = tmp_path / "source.bin"
+    destination = tmp_path / "destination.bin"
+    source.write_bytes(payload)
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        copied = storage._copy_in_kernel(src.fileno(), dst.fileno(), len(payload))
+    if copied:
+        assert destination.read_bytes() == payload
+
+
+def test_move_file_propagates_other_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        move_file(str(tmp_path / "missing.bin"), str(tmp_path / "destination.bin"))
+
+
+class FakeShare:
+    """Stands in for the pooled SMB connections, recording what reaches the share"""
+
+    def __init__(self):
+        self.files = {}
+
+    def upload(self, local_path, smb_path, destination_config, overwrite=False):
+        if os.path.basename(local_path).endswith(".mp4") and self.fail_video:
+            return False
+        with open(local_path, 'rb') as f:
+            self.files[smb_path] = f.read()
+        return True
+
+    def deleteFiles(self, share, path):
+        del self.files[path]
+
+    def rename(self, share, old_path, new_path):
+        self.files[new_path] = self.files.pop(old_path)
+
+
+@pytest.fixture
+def smb_manager(monkeypatch):
+    from contextlib import contextmanager
+
+    fake = FakeShare()
+    manager = storage.StorageManager(smb_parallelism=2)
+
+    @contextmanager
+    def connection(destination_config):
+        yield fake
+
+    monkeypatch.setattr(manager, "upload_to_smb", fake.upload)
+    monkeypatch.setattr(manager, "_smb_connection", connection)
+    monkeypatch.setattr(storage.StorageManager, "_smb_path_exists",
+                        staticmethod(lambda conn, share, path: path in fake.files))
+    yield manager, fake
+    manager._upload_executor.shutdown()
+
+
+@pytest.mark.parametrize("fail_video", [False, True])
+def test_manage_smb_file_commits_nfo_only_after_video(tmp_path, smb_manager, fail_video):
+    manager, share = smb_manager
+    share.fail_video = fail_video
+    video = tmp_path / "clip.mp4"
+    nfo = tmp_path / "clip.nfo"
+    video.write_bytes(b"video")
+    nfo.write_bytes(b"<movie/>")
+    destination = {'type': 'smb', 'share': 'Media', 'path': 'videos'}
+
+    assert manager.manage_file(str(video), destination) is not fail_video
+
+    if fail_video:
+        assert share.files == {}
+        assert video.exists() and nfo.exists()
+    else:
+        assert share.files == {os.path.join('videos', 'clip.mp4'): b"video",
+                               os.path.join('videos', 'clip.nfo'): b"<movie/>"}
+        assert not video.exists() and not nfo.exists()
+
+
+@pytest.mark.parametrize("size", [0, 1, 5 * 1024 * 1024 + 3])
+def test_allocate_file_sizes_the_file(tmp_path, size):
+    path = tmp_path / "allocated.bin"
+    with open(path, 'wb') as f:
+        storage.allocate_file(f.fileno(), size)
+    assert path.stat().st_size == size
@@ -0,0 +1,253 @@
+"""Tests pinning smutscrape.utilities helpers to the behaviour of their earlier implementations"""
+
+import random
+import re
+
+import pytest
+
+from smutscrape import utilities
+from smutscrape.utilities import (
+    construct_filename, parse_url_pattern, pattern_to_regex, probe_font_widths, should_ignore_video,
+    _ignored_term_finder,
+)
+
+
+def legacy_term_found(text, ignored_terms):
+    """The original per-term matcher used by should_ignore_video"""
+    text_lower = text.lower()
+    for term in ignored_terms:
+        term_lower = term.lower()
+        encoded = term_lower.replace(' ', '-')
+        if (re.search(r'\b' + re.escape(term_lower) + r'\b', text_lower)
+                or re.search(r'\b' + re.escape(encoded) + r'\b', text_lower)):
+            return True
+    return False
+
+
+def legacy_parse_url_pattern(pattern):
+    """The original character-by-character URL pattern parser"""
+    components = []
+    current_segment = ""
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == "{":
+            if current_segment:
+                components.append({"type": "static", "value": current_segment})
+                current_segment = ""
+            j = i + 1
+            while j < len(pattern) and pattern[j] != "}":
+                j += 1
+            if j < len(pattern):
+                placeholder = pattern[i+1:j]
+                components.append({"type": "wildcard", "name": placeholder, "numeric": placeholder == "page"})
+                i = j + 1
+            else:
+                raise ValueError(f"Unclosed placeholder in pattern: {pattern}")
+        else:
+            current_segment += pattern[i]
+            i += 1
+    if current_segment:
+        components.append({"type": "static", "value": current_segment})
+    return components
+
+
+def legacy_pattern_to_regex(pattern):
+    """The original character-by-character pattern_to_regex, returning the regex source"""
+    regex = ""
+    static_count = 0
+    static_length = 0
+    in_wildcard = False
+    current_static = ""
+    wildcard_name = ""
+    for char in pattern.rstrip("/"):
+        if char == "{":
+            if current_static:
+                regex += re.escape(current_static)
+                static_count += 1
+                static_length += len(current_static)
+                current_static = ""
+            in_wildcard = True
+            wildcard_name = ""
+        elif char == "}":
+            if in_wildcard:
+                if wildcard_name == "page":
+                    regex += f"(?P<{wildcard_name}>\\d+)"
+                else:
+                    regex += f"(?P<{wildcard_name}>[^/?&#]+)"
+                in_wildcard = False
+            else:
+                current_static += char
+        elif in_wildcard:
+            wildcard_name += char
+        else:
+            current_static += char
+    if current_static:
+        regex += re.escape(current_static)
+        static_count += 1
+        static_length += len(current_static)
+    if "?" not in pattern and "&" not in pattern:
+        regex = f"^{regex}$"
+    else:
+        regex = f"^{regex}(?:$|&.*)"
+    return regex, static_count, static_length
+
+
+IGNORED_TERMS = ["Bad Term", "worse", "c++", "x-rated", "émoji"]
+IGNORE_SAMPLES = [
+    "A perfectly fine title",
+    "Contains a bad term here",
+    "contains-bad-term-encoded",
+    "BADTERM joined",
+    "worsen is not worse",
+    "worsened",
+    "learning c++ today",
+    "X-RATED cut",
+    "xrated",
+    "Émoji party",
+    "",
+    "bad\x00term",
+]
+
+
+@pytest.mark.parametrize("text", IGNORE_SAMPLES)
+def test_ignored_term_finder_matches_legacy(text):
+    find = _ignored_term_finder(tuple(IGNORED_TERMS))
+    assert (find(text) is not None) == legacy_term_found(text, IGNORED_TERMS)
+
+
+def test_ignored_term_finder_matches_legacy_for_long_term_lists():
+    # Large lists take the automaton (when installed) or a single alternation without the prefilter
+    terms = tuple(f"term{i}" for i in range(100)) + tuple(IGNORED_TERMS)
+    find = _ignored_term_finder(terms)
+    for text in IGNORE_SAMPLES + ["has term42 inside", "term420", "TERM99!"]:
+        assert (find(text) is not None) == legacy_term_found(text, terms), text
+
+
+def test_ignored_term_finder_reports_the_term():
+    find = _ignored_term_finder(tuple(IGNORED_TERMS))
+    assert find("so bad-term") == "bad term"
+    assert find("nothing") is None
+
+
+def test_should_ignore_video_does_not_match_across_fields():
+    data = {"title": "something bad", "tags": ["term", "fine"]}
+    assert not should_ignore_video(data, ["bad term"])
+    data["tags"].append("Bad Term")
+    assert should_ignore_video(data, ["bad term"])
+    assert not should_ignore_video(data, [])
+
+
+URL_PATTERNS = [
+    "/video/{video_id}",
+    "/search/{search}/{page}/",
+    "/tags/{tag}?page={page}",
+    "{page}",
+    "/static/only",
+    "/a}b/{x}c",
+    "",
+    "/{a}{b}",
+]
+
+
+@pytest.mark.parametrize("pattern", URL_PATTERNS)
+def test_parse_url_pattern_matches_legacy(pattern):
+    assert parse_url_pattern(pattern) == legacy_parse_url_pattern(pattern)
+
+
+@pytest.mark.parametrize("pattern", ["/video/{video_id", "/a/{b}/{"])
+def test_parse_url_pattern_rejects_unclosed_placeholders(pattern):
+    with pytest.raises(ValueError):
+        legacy_parse_url_pattern(pattern)
+    with pytest.raises(ValueError):
+        parse_url_pattern(pattern)
+
+
+def test_parse_url_pattern_returns_independent_copies():
+    components = parse_url_pattern("/video/{video_id}")
+    components[0]["value"] = "changed"
+    components.append({"type": "static", "value": "extra"})
+    assert parse_url_pattern("/video/{video_id}") == legacy_parse_url_pattern("/video/{video_id}")
+
+
+def test_parse_url_pattern_matches_legacy_on_random_patterns():
+    rng = random.Random(1234)
+    alphabet = "ab/?&{}_"
+    for _ in range(5000):
+        pattern = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        try:
+            expected = legacy_parse_url_pattern(pattern)
+        except ValueError:
+            with pytest.raises(ValueError):
+                parse_url_pattern(pattern)
+        else:
+            assert parse_url_pattern(pattern) == expected, pattern
+
+
+def test_pattern_to_regex_matches_legacy_on_random_patterns():
+    rng = random.Random(1234)
+    alphabet = "ab/?&{}_"
+    for pattern in URL_PATTERNS + ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+                                   for _ in range(5000)]:
+        regex, static_count, static_length = legacy_pattern_to_regex(pattern)
+        try:
+            expected = (re.compile(regex, re.IGNORECASE), static_count, static_length)
+        except re.error:
+            with pytest.raises(re.error):
+                pattern_to_regex(pattern)
+        else:
+            assert pattern_to_regex(pattern) == expected, pattern
+
+
+def filename_config(max_chars=255, make_unique=False):
+    return {
+        'file_naming': {
+            'extension': '.mp4',
+            'invalid_chars': ['/', ':'],
+            'max_chars': max_chars,
+            'make_unique': make_unique,
+        }
+    }
+
+
+@pytest.mark.parametrize("char", ["a", "é", "日", "🎬"])
+def test_construct_filename_byte_trim(char):
+    site_config = {'name_prefix': 'Pre ', 'name_suffix': ' Suf'}
+    filename = construct_filename(char * 300, site_config, filename_config())
+    encoded = filename.encode('utf-8')
+    assert len(encoded) <= 255
+    # The cut lands on a codepoint boundary and keeps as much of the title as fits
+    assert len(encoded) > 255 - len(char.encode('utf-8'))
+    assert filename.startswith('Pre ' + char)
+    assert filename.endswith(' Suf.mp4')
+
+
+def test_construct_filename_short_title_untouched():
+    filename = construct_filename("A: short/title", {}, filename_config())
+    assert filename == utilities.process_title("A: short/title", ['/', ':']) + ".mp4"
+
+
+def test_construct_filename_unique_id():
+    filename = construct_filename("日" * 300, {'unique_name': True}, filename_config())
+    assert len(filename.encode('utf-8')) <= 255
+    assert re.search(r'_[a-z2-7]{6}\.mp4$', filename)
+
+
+BANNER_FONTS = ["standard", "alpha", "alligator", "block", "small", "big", "tiny", "banner", "doom", "slant", "mini"]
+
+
+def pick_font(font_widths, max_width):
+    """render_ascii's choice: the widest font that fits, else the narrowest"""
+    fitting = [(font, width) for font, width in font_widths.items() if width <= max_width]
+    if fitting:
+        return sorted(fitting, key=lambda x: x[1], reverse=True)[0]
+    return sorted(font_widths.items(), key=lambda x: x[1])[0]
+
+
+@pytest.mark.parametrize("text", ["motherless", "I.T.", "spank bang"])
+@pytest.mark.parametrize("max_width", [20, 60, 154, 400])
+def test_probe_font_widths_skipping_keeps_the_choice(tmp_path, monkeypatch, text, max_width):
+    pytest.importorskip("art")
+    monkeypatch.setattr(utilities, "FONT_WIDTH_CACHE_PATH", str(tmp_path / "font_widths.json"))
+    monkeypatch.setattr(utilities, "_font_glyph_widths", None)
+    all_widths = probe_font_widths(text, BANNER_FONTS)
+    assert pick_font(probe_font_widths(text, BANNER_FONTS, max_width), max_width) == pick_font(all_widths, max_width)